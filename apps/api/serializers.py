@@ -1,17 +1,30 @@
+import csv
+
 from rest_framework import serializers
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.utils import datetime_from_epoch
+from django.db.models import OuterRef, Prefetch, Subquery
+from apps.common.authentication import cache_token_version, set_token_claims
+from apps.common.mixins import SparseFieldsetMixin
+from apps.common.token_blacklist import consume_token
+from apps.users.provisioning import missing_columns
 from apps.users.models import *
 from apps.programs.models import *
 from apps.applications.models import *
 from apps.payments.models import *
 from apps.dashboard.models import *
+from apps.dashboard.statistics import DIMENSIONS as STATISTICS_DIMENSIONS
 
 # User & Authentication Serializers
-class RoleSerializer(serializers.ModelSerializer):
+class RoleSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Role
         fields = ['id', 'role']
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     role = RoleSerializer(read_only=True)
     
     class Meta:
@@ -34,33 +47,69 @@ class RegisterSerializer(serializers.ModelSerializer):
     
     def create(self, validated_data):
         validated_data.pop('password2')
-        user = CustomUser.objects.create_user(**validated_data)
         # Assign applicant role by default
         applicant_role, _ = Role.objects.get_or_create(role='applicant')
-        user.role = applicant_role
-        user.save()
-        return user
+        return CustomUser.objects.create_user(role=applicant_role, **validated_data)
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Login serializer adding role, profile and version claims to the tokens."""
+    
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        set_token_claims(token, user)
+        cache_token_version(user.pk, user.token_version)
+        return token
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Refresh serializer that rotates single-use refresh tokens and re-reads the
+    claims, so role changes apply on the next refresh.
+    """
+    
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        if jwt_settings.ROTATE_REFRESH_TOKENS and jwt_settings.BLACKLIST_AFTER_ROTATION:
+            # Each refresh token is good for one rotation
+            expires_at = datetime_from_epoch(refresh['exp'])
+            if not consume_token(refresh[jwt_settings.JTI_CLAIM], expires_at):
+                raise InvalidToken('Token is blacklisted')
+        user = CustomUser.objects.select_related('role', 'student_profile').filter(
+            pk=refresh.payload.get(jwt_settings.USER_ID_CLAIM)
+        ).first()
+        if user is None or not jwt_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(self.error_messages['no_active_account'], 'no_active_account')
+        
+        set_token_claims(refresh, user)
+        cache_token_version(user.pk, user.token_version)
+        data = {'access': str(refresh.access_token)}
+        if jwt_settings.ROTATE_REFRESH_TOKENS:
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data['refresh'] = str(refresh)
+        return data
 
 # Student Profile Serializers
-class PersonalInformationSerializer(serializers.ModelSerializer):
+class PersonalInformationSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = PersonalInformation
         fields = '__all__'
         read_only_fields = ['student']
 
-class ContactInformationSerializer(serializers.ModelSerializer):
+class ContactInformationSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = ContactInformation
         fields = '__all__'
         read_only_fields = ['student']
 
-class StudentRelativeSerializer(serializers.ModelSerializer):
+class StudentRelativeSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = StudentRelative
         fields = '__all__'
         read_only_fields = ['student']
 
-class EducationalBackgroundSerializer(serializers.ModelSerializer):
+class EducationalBackgroundSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     institution_name = serializers.CharField(source='institution.name', read_only=True)
     degree_name = serializers.CharField(source='degree.name', read_only=True)
     
@@ -69,7 +118,7 @@ class EducationalBackgroundSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ['student', 'percentage']
 
-class MedicalInformationSerializer(serializers.ModelSerializer):
+class MedicalInformationSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     blood_group_name = serializers.CharField(source='blood_group.name', read_only=True)
     diseases_list = serializers.StringRelatedField(source='diseases', many=True, read_only=True)
     
@@ -78,74 +127,102 @@ class MedicalInformationSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ['student']
 
-class StudentProfileSerializer(serializers.ModelSerializer):
+class StudentProfileSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     personal_info = PersonalInformationSerializer(source='personalinformation', read_only=True)
     contact_info = ContactInformationSerializer(source='contactinformation', read_only=True)
     relatives = StudentRelativeSerializer(many=True, read_only=True)
     educational_records = EducationalBackgroundSerializer(many=True, read_only=True)
     medical_info = MedicalInformationSerializer(source='medicalinformation', read_only=True)
-    profile_completion = serializers.SerializerMethodField()
+    profile_completion = serializers.IntegerField(read_only=True)
     
     class Meta:
         model = StudentProfile
         fields = '__all__'
         read_only_fields = ['user']
     
-    def get_profile_completion(self, obj):
-        completion = 0
-        if hasattr(obj, 'personalinformation'):
-            completion += 25
-        if hasattr(obj, 'contactinformation'):
-            completion += 25
-        if obj.educational_records.exists():
-            completion += 25
-        if hasattr(obj, 'medicalinformation'):
-            completion += 25
-        return completion
+    @staticmethod
+    def setup_eager_loading(queryset, prefix=''):
+        """Load every nested section in a fixed number of queries."""
+        queryset = queryset.select_related(
+            f'{prefix}user__role',
+            f'{prefix}personalinformation',
+            f'{prefix}contactinformation',
+            f'{prefix}medicalinformation__blood_group',
+        )
+        return queryset.prefetch_related(
+            f'{prefix}relatives',
+            Prefetch(
+                f'{prefix}educational_records',
+                queryset=EducationalBackground.objects.select_related('institution', 'degree'),
+            ),
+            f'{prefix}medicalinformation__diseases',
+        )
+    
+
+class StudentProfileListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    email = serializers.EmailField(source='user.email', read_only=True)
+    full_name = serializers.CharField(source='user.get_full_name', read_only=True)
+    cnic = serializers.CharField(source='user.cnic', read_only=True)
+    
+    class Meta:
+        model = StudentProfile
+        fields = ['id', 'user', 'email', 'full_name', 'cnic', 'created_at']
+    
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return queryset.select_related('user')
 
 # Program Serializers
-class CourseSerializer(serializers.ModelSerializer):
+class CourseSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Course
         fields = ['id', 'name', 'code', 'is_active']
 
-class ProgramSerializer(serializers.ModelSerializer):
+class ProgramSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     courses = CourseSerializer(many=True, read_only=True)
     
     class Meta:
         model = Program
         fields = ['id', 'name', 'code', 'courses', 'is_active']
 
-class AcademicSessionSerializer(serializers.ModelSerializer):
+class AcademicSessionSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = AcademicSession
         fields = ['id', 'session', 'start_date', 'end_date', 'is_current']
 
-class OfferedProgramSerializer(serializers.ModelSerializer):
+class OfferedProgramSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     program = ProgramSerializer(read_only=True)
     session = AcademicSessionSerializer(read_only=True)
-    available_seats = serializers.SerializerMethodField()
+    available_seats = serializers.IntegerField(read_only=True)
+    sold_out = serializers.BooleanField(read_only=True)
     
     class Meta:
         model = OfferedProgram
         fields = '__all__'
+        read_only_fields = ['approved_count']
+
+class OfferedProgramListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    program_name = serializers.CharField(source='program.name', read_only=True)
+    program_code = serializers.CharField(source='program.code', read_only=True)
+    session_name = serializers.CharField(source='session.session', read_only=True)
+    available_seats = serializers.IntegerField(read_only=True)
+    sold_out = serializers.BooleanField(read_only=True)
     
-    def get_available_seats(self, obj):
-        approved_count = Application.objects.filter(
-            program=obj.program,
-            academic_session=obj.session,
-            status__code='approved'
-        ).count()
-        return obj.total_seats - approved_count
+    class Meta:
+        model = OfferedProgram
+        fields = [
+            'id', 'program', 'program_name', 'program_code', 'session', 'session_name',
+            'total_seats', 'approved_count', 'available_seats', 'sold_out', 'is_active',
+        ]
 
 # Application Serializers
-class ApplicationStatusSerializer(serializers.ModelSerializer):
+class ApplicationStatusSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = ApplicationStatus
         fields = '__all__'
 
-class ApplicationSerializer(serializers.ModelSerializer):
+class ApplicationSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     student = StudentProfileSerializer(read_only=True)
     program = ProgramSerializer(read_only=True)
     session = AcademicSessionSerializer(source='academic_session', read_only=True)
@@ -153,28 +230,96 @@ class ApplicationSerializer(serializers.ModelSerializer):
     can_apply = serializers.SerializerMethodField()
     payment_status = serializers.SerializerMethodField()
     
+    sparse_field_sources = {
+        'can_apply': ['student'],
+    }
+    
     class Meta:
         model = Application
         fields = '__all__'
         read_only_fields = ['tracking_id', 'application_form_no', 'verification_hash']
     
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Query plan for serializing many applications without per-row lookups."""
+        queryset = queryset.select_related('program', 'academic_session', 'status')
+        queryset = queryset.prefetch_related('program__courses')
+        queryset = StudentProfileSerializer.setup_eager_loading(queryset, prefix='student__')
+        return queryset.annotate(
+            application_payment_status=Subquery(
+                Payment.objects.filter(
+                    application=OuterRef('pk'),
+                    payment_type='application'
+                ).order_by('pk').values('status')[:1]
+            ),
+        )
+    
     def get_can_apply(self, obj):
         # Check if student profile is complete
-        student = obj.student
-        return (hasattr(student, 'personalinformation') and 
-                hasattr(student, 'contactinformation') and
-                student.educational_records.exists())
+        return obj.student.has_sections(
+            StudentProfile.PERSONAL | StudentProfile.CONTACT | StudentProfile.EDUCATION
+        )
     
     def get_payment_status(self, obj):
+        if hasattr(obj, 'application_payment_status'):
+            return obj.application_payment_status or 'not_paid'
         payments = obj.payments.filter(payment_type='application')
         if payments.exists():
             return payments.first().status
         return 'not_paid'
 
+class ApplicationListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    student_name = serializers.CharField(source='student.user.get_full_name', read_only=True)
+    program_name = serializers.CharField(source='program.name', read_only=True)
+    session = serializers.CharField(source='academic_session.session', read_only=True)
+    status_code = serializers.CharField(source='status.code', read_only=True, default=None)
+    status_name = serializers.CharField(source='status.name', read_only=True, default=None)
+    payment_status = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = Application
+        fields = [
+            'id', 'tracking_id', 'application_form_no', 'student', 'student_name',
+            'program', 'program_name', 'academic_session', 'session',
+            'status', 'status_code', 'status_name', 'payment_status',
+            'preference', 'merit_score', 'merit_position', 'applied_at',
+        ]
+    
+    @staticmethod
+    def setup_eager_loading(queryset):
+        queryset = queryset.select_related('student__user', 'program', 'academic_session', 'status')
+        return queryset.annotate(
+            application_payment_status=Subquery(
+                Payment.objects.filter(
+                    application=OuterRef('pk'),
+                    payment_type='application'
+                ).order_by('pk').values('status')[:1]
+            ),
+        )
+    
+    def get_payment_status(self, obj):
+        return obj.application_payment_status or 'not_paid'
+
+class StudentDossierSerializer(StudentProfileSerializer):
+    """Every section of an applicant's profile together with their applications."""
+    applications = ApplicationListSerializer(many=True, read_only=True)
+
+    @staticmethod
+    def setup_eager_loading(queryset, prefix=''):
+        queryset = StudentProfileSerializer.setup_eager_loading(queryset, prefix=prefix)
+        return queryset.prefetch_related(
+            Prefetch(
+                f'{prefix}applications',
+                queryset=ApplicationListSerializer.setup_eager_loading(
+                    Application.objects.order_by('-applied_at', '-id')
+                ),
+            ),
+        )
+
 class ApplicationCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Application
-        fields = ['program', 'academic_session']
+        fields = ['program', 'academic_session', 'preference']
     
     def validate(self, attrs):
         request = self.context['request']
@@ -184,10 +329,7 @@ class ApplicationCreateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Please complete your profile first")
         
         # Check profile completion
-        if not (hasattr(student_profile, 'personalinformation') and 
-                hasattr(student_profile, 'contactinformation') and
-                student_profile.educational_records.exists() and
-                hasattr(student_profile, 'medicalinformation')):
+        if not student_profile.has_sections(StudentProfile.ALL_SECTIONS):
             raise serializers.ValidationError("Please complete all profile sections before applying")
         
         # Check if already applied
@@ -203,12 +345,12 @@ class ApplicationCreateSerializer(serializers.ModelSerializer):
         return attrs
 
 # Payment Serializers
-class PaymentMethodSerializer(serializers.ModelSerializer):
+class PaymentMethodSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = PaymentMethod
         fields = '__all__'
 
-class FeeStructureSerializer(serializers.ModelSerializer):
+class FeeStructureSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     program = ProgramSerializer(read_only=True)
     session = AcademicSessionSerializer(read_only=True)
     
@@ -216,7 +358,7 @@ class FeeStructureSerializer(serializers.ModelSerializer):
         model = FeeStructure
         fields = '__all__'
 
-class PaymentSerializer(serializers.ModelSerializer):
+class PaymentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     application = ApplicationSerializer(read_only=True)
     payment_method = PaymentMethodSerializer(read_only=True)
     
@@ -224,6 +366,32 @@ class PaymentSerializer(serializers.ModelSerializer):
         model = Payment
         fields = '__all__'
         read_only_fields = ['transaction_id', 'verified_by']
+    
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return queryset.select_related('payment_method').prefetch_related(
+            Prefetch(
+                'application',
+                queryset=ApplicationSerializer.setup_eager_loading(Application.objects.all()),
+            )
+        )
+
+class PaymentListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    tracking_id = serializers.CharField(source='application.tracking_id', read_only=True)
+    student_name = serializers.CharField(source='application.student.user.get_full_name', read_only=True)
+    payment_method_name = serializers.CharField(source='payment_method.name', read_only=True, default=None)
+    
+    class Meta:
+        model = Payment
+        fields = [
+            'id', 'application', 'tracking_id', 'student_name', 'payment_type', 'amount',
+            'payment_method', 'payment_method_name', 'transaction_id', 'status',
+            'paid_at', 'created_at',
+        ]
+    
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return queryset.select_related('application__student__user', 'payment_method')
 
 class PaymentCreateSerializer(serializers.ModelSerializer):
     class Meta:
@@ -231,7 +399,7 @@ class PaymentCreateSerializer(serializers.ModelSerializer):
         fields = ['application', 'payment_type', 'amount', 'payment_method', 'bank_reference', 'receipt']
 
 # Dashboard Serializers
-class AnnouncementSerializer(serializers.ModelSerializer):
+class AnnouncementSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     created_by = UserSerializer(read_only=True)
     target_roles = RoleSerializer(many=True, read_only=True)
     
@@ -239,7 +407,7 @@ class AnnouncementSerializer(serializers.ModelSerializer):
         model = Announcement
         fields = '__all__'
 
-class AdmissionStatsSerializer(serializers.ModelSerializer):
+class AdmissionStatsSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     program = ProgramSerializer(read_only=True)
     session = AcademicSessionSerializer(read_only=True)
     
@@ -248,22 +416,22 @@ class AdmissionStatsSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 # Lookup Serializers
-class DegreeSerializer(serializers.ModelSerializer):
+class DegreeSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Degree
         fields = '__all__'
 
-class InstituteSerializer(serializers.ModelSerializer):
+class InstituteSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Institute
         fields = '__all__'
 
-class BloodGroupSerializer(serializers.ModelSerializer):
+class BloodGroupSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = BloodGroup
         fields = '__all__'
 
-class DiseaseSerializer(serializers.ModelSerializer):
+class DiseaseSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Disease
         fields = '__all__'
@@ -273,7 +441,74 @@ class ApplicationStatusUpdateSerializer(serializers.Serializer):
     status_id = serializers.IntegerField()
     remarks = serializers.CharField(required=False, allow_blank=True)
 
-class ApplicationTrackingSerializer(serializers.ModelSerializer):
+class ApplicationBulkStatusUpdateSerializer(serializers.Serializer):
+    application_ids = serializers.ListField(
+        child=serializers.IntegerField(), allow_empty=False, max_length=5000
+    )
+    status_id = serializers.IntegerField()
+    remarks = serializers.CharField(required=False, allow_blank=True)
+
+class ApplicationStatisticsQuerySerializer(serializers.Serializer):
+    group_by = serializers.CharField(required=False, allow_blank=True)
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    
+    def validate_group_by(self, value):
+        dimensions = [item.strip() for item in value.split(',') if item.strip()]
+        invalid = [item for item in dimensions if item not in STATISTICS_DIMENSIONS]
+        if invalid:
+            raise serializers.ValidationError(
+                f"Unknown dimension(s): {', '.join(invalid)}. Choose from {', '.join(STATISTICS_DIMENSIONS)}."
+            )
+        return list(dict.fromkeys(dimensions))
+
+class MeritComputeSerializer(serializers.Serializer):
+    session_id = serializers.IntegerField()
+    program_id = serializers.IntegerField(required=False)
+    weights = serializers.DictField(child=serializers.FloatField(min_value=0), required=False, allow_empty=False)
+    tie_breakers = serializers.ListField(child=serializers.CharField(), required=False)
+
+class SeatAllocationSerializer(serializers.Serializer):
+    session_id = serializers.IntegerField()
+    commit = serializers.BooleanField(default=False)
+
+class AdmissionLetterIssueSerializer(serializers.Serializer):
+    session_id = serializers.IntegerField()
+    force = serializers.BooleanField(default=False)
+
+class UserProvisioningSerializer(serializers.Serializer):
+    file = serializers.FileField()
+    default_role = serializers.ChoiceField(choices=Role.ROLE_CHOICES, default='applicant')
+    
+    def validate_file(self, value):
+        header = value.readline().decode('utf-8-sig', errors='replace')
+        value.seek(0)
+        missing = missing_columns(next(csv.reader([header]), []))
+        if missing:
+            raise serializers.ValidationError(f"CSV is missing columns: {', '.join(missing)}")
+        return value
+
+class ApplicationVerificationSerializer(serializers.Serializer):
+    tracking_id = serializers.CharField()
+    name = serializers.CharField()
+    program = serializers.CharField()
+    session = serializers.CharField()
+    status = serializers.CharField(allow_null=True)
+    status_name = serializers.CharField(allow_null=True)
+
+class ApplicantSearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(min_length=2, max_length=100)
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=20)
+
+class ExportQuerySerializer(serializers.Serializer):
+    file_type = serializers.ChoiceField(choices=['csv', 'xlsx'], default='csv')
+    program = serializers.IntegerField(required=False)
+    session = serializers.IntegerField(required=False)
+    status = serializers.CharField(required=False)
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+
+class ApplicationTrackingSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     status = ApplicationStatusSerializer(read_only=True)
     changed_by = UserSerializer(read_only=True)
     
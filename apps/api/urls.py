@@ -6,6 +6,7 @@ from drf_spectacular.views import (
     SpectacularSwaggerView,
 )
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from apps.common.throttling import LoginAccountThrottle, LoginIPThrottle
 from .views import *
 from .user_management import UserManagementViewSet
 
@@ -53,7 +54,11 @@ urlpatterns = [
     path('redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
     
     # Authentication Endpoints
-    path('auth/login/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
+    path(
+        'auth/login/',
+        TokenObtainPairView.as_view(throttle_classes=[LoginIPThrottle, LoginAccountThrottle]),
+        name='token_obtain_pair',
+    ),
     path('auth/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('auth/register/', RegisterView.as_view(), name='register'),
     path('auth/profile/', UserProfileView.as_view(), name='profile'),
@@ -63,6 +68,12 @@ urlpatterns = [
     path('profile/contact-info/', ContactInformationView.as_view(), name='contact-info'),
     path('profile/medical-info/', MedicalInformationView.as_view(), name='medical-info'),
     
+    # Applicant search
+    path('search/', ApplicantSearchView.as_view(), name='applicant-search'),
+    
+    # Public QR code verification
+    path('verify/<str:verification_hash>/', ApplicationVerificationView.as_view(), name='verify-application'),
+    
     # Include router URLs
     path('', include(router.urls)),
 ]
\ No newline at end of file
@@ -1,20 +1,31 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 from django.contrib.auth.models import Group
+from apps.common.authentication import forget_token_versions
+from apps.common.mixins import SparseFieldsetViewMixin
+from apps.common.pagination import UserCursorPagination
 from apps.common.permissions import IsAdminUser
+from apps.common.tasks import enqueue
 from apps.users.models import CustomUser, Role
-from .serializers import UserSerializer, RoleSerializer
+from apps.users.provisioning import store_upload
+from .serializers import UserSerializer, RoleSerializer, UserProvisioningSerializer
 
-class UserManagementViewSet(viewsets.ModelViewSet):
+class UserManagementViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """
     API endpoint for user management (admin only)
     """
     serializer_class = UserSerializer
     permission_classes = [IsAdminUser]
+    pagination_class = UserCursorPagination
     
     def get_queryset(self):
-        return CustomUser.objects.all().order_by('-date_joined')
+        return CustomUser.objects.select_related('role').order_by('-date_joined')
+    
+    def perform_destroy(self, instance):
+        forget_token_versions([instance.pk])
+        instance.delete()
     
     @action(detail=True, methods=['post'])
     def activate(self, request, pk=None):
@@ -37,9 +48,24 @@ class UserManagementViewSet(viewsets.ModelViewSet):
             role_id = request.data.get('role_id')
             role = Role.objects.get(id=role_id)
             user.role = role
+            # Saving revokes tokens carrying the old role; clients must refresh to get the new one
             user.save()
             return Response({'status': 'role updated', 'role': RoleSerializer(role).data})
         except Role.DoesNotExist:
             return Response({'error': 'Role not found'}, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
-            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    @action(detail=False, methods=['post'], parser_classes=[MultiPartParser])
+    def provision(self, request):
+        serializer = UserProvisioningSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        # The import can take minutes, so it runs as a background job on a private copy
+        name = store_upload(serializer.validated_data['file'])
+        enqueue(
+            'apps.users.provisioning.provision_users_file',
+            name,
+            default_role=serializer.validated_data['default_role'],
+        )
+        return Response({'message': 'Accounts are being provisioned'}, status=status.HTTP_202_ACCEPTED)
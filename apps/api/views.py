@@ -1,21 +1,44 @@
 from rest_framework import generics, permissions, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
-from django.db.models import Q, Count
+from django.db.models import Q
+from django.db import transaction
 from django.utils import timezone
+from django.utils.http import parse_etags
+from apps.common.mixins import SparseFieldsetViewMixin
+from apps.common.pagination import (
+    ApplicationCursorPagination,
+    ApplicationTrackingCursorPagination,
+    PaymentCursorPagination,
+)
 from apps.common.permissions import *
+from apps.common.tasks import enqueue
+from apps.common.throttling import RegisterIPThrottle, VerificationIPThrottle
 from apps.users.models import *
 from apps.programs.models import *
 from apps.applications.models import *
+from apps.applications.allocation import allocate_seats
+from apps.applications.dossier import dossier_etag, dossier_versions
+from apps.applications.letters import issue_admission_letters
+from apps.applications.merit import compute_merit
+from apps.applications.search import search_applicants
+from apps.applications.services import bulk_update_status, transition_status
+from apps.applications.verification import get_verification, invalidate_verification
 from apps.payments.models import *
 from apps.dashboard.models import *
+from apps.dashboard.exports import stream_export
+from apps.dashboard.services import record_removal
+from apps.dashboard.statistics import get_statistics, get_status_summary
+from apps.programs.services import SeatsUnavailable, release_seats
 from .serializers import *
 import uuid
 
 # ==================== AUTHENTICATION VIEWS ====================
 class RegisterView(generics.CreateAPIView):
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [RegisterIPThrottle]
     serializer_class = RegisterSerializer
     
     def post(self, request, *args, **kwargs):
@@ -33,16 +56,42 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
     
     def get_object(self):
         return self.request.user
+    
+    def perform_update(self, serializer):
+        user = serializer.save()
+        # The applicant's name is part of the public verification response
+        invalidate_verification(
+            Application.objects.filter(student__user=user).values_list('verification_hash', flat=True)
+        )
 
 # ==================== STUDENT PROFILE MANAGEMENT ====================
-class StudentProfileViewSet(viewsets.ModelViewSet):
+def get_student_profile_id(request):
+    """The applicant's profile id from their token, or 404 when they have no profile."""
+    profile_id = request.user.student_profile_id
+    if profile_id is None:
+        raise Http404("No StudentProfile matches the given query.")
+    return profile_id
+
+class StudentProfileViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     serializer_class = StudentProfileSerializer
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        if self.request.user.role.role == 'applicant':
-            return StudentProfile.objects.filter(user=self.request.user)
-        return StudentProfile.objects.all()
+        queryset = StudentProfile.objects.order_by('id')
+        if self.request.user.role_code == 'applicant':
+            queryset = queryset.filter(user_id=self.request.user.pk)
+        if self.action == 'list':
+            queryset = StudentProfileListSerializer.setup_eager_loading(queryset)
+        elif self.action == 'retrieve':
+            queryset = StudentProfileSerializer.setup_eager_loading(queryset)
+        return queryset
+    
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return StudentProfileListSerializer
+        if self.action == 'dossier':
+            return StudentDossierSerializer
+        return StudentProfileSerializer
     
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -50,7 +99,7 @@ class StudentProfileViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get', 'post', 'put'], permission_classes=[IsApplicant])
     def my_profile(self, request):
         try:
-            profile = StudentProfile.objects.get(user=request.user)
+            profile = StudentProfile.objects.get(user_id=request.user.pk)
             if request.method == 'GET':
                 serializer = StudentProfileSerializer(profile)
                 return Response(serializer.data)
@@ -66,70 +115,100 @@ class StudentProfileViewSet(viewsets.ModelViewSet):
                 serializer.save(user=request.user)
                 return Response(serializer.data, status=status.HTTP_201_CREATED)
             return Response({'error': 'Profile not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    @action(detail=False, methods=['get'], permission_classes=[IsApplicant])
+    def dossier(self, request):
+        """
+        The applicant's whole profile and applications in one response.
+        
+        Answers ``If-None-Match`` with 304 using a single query.
+        """
+        profiles = StudentProfile.objects.filter(user_id=request.user.pk)
+        versions = dossier_versions(profiles)
+        if versions is None:
+            return Response({'error': 'Profile not found'}, status=status.HTTP_404_NOT_FOUND)
+        
+        etag = dossier_etag(versions, request.query_params.urlencode())
+        headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+        if_none_match = parse_etags(request.headers.get('If-None-Match', ''))
+        if etag in if_none_match or '*' in if_none_match:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        
+        profile = self.filter_queryset(StudentDossierSerializer.setup_eager_loading(profiles)).first()
+        if profile is None:
+            return Response({'error': 'Profile not found'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(self.get_serializer(profile).data, headers=headers)
 
 class PersonalInformationView(generics.CreateAPIView, generics.RetrieveUpdateAPIView):
     serializer_class = PersonalInformationSerializer
     permission_classes = [IsApplicant]
     
     def get_object(self):
-        profile = get_object_or_404(StudentProfile, user=self.request.user)
-        return get_object_or_404(PersonalInformation, student=profile)
+        return get_object_or_404(PersonalInformation, student_id=get_student_profile_id(self.request))
     
     def perform_create(self, serializer):
         profile, created = StudentProfile.objects.get_or_create(user=self.request.user)
         serializer.save(student=profile)
+        profile.mark_section(StudentProfile.PERSONAL)
 
 class ContactInformationView(generics.CreateAPIView, generics.RetrieveUpdateAPIView):
     serializer_class = ContactInformationSerializer
     permission_classes = [IsApplicant]
     
     def get_object(self):
-        profile = get_object_or_404(StudentProfile, user=self.request.user)
-        return get_object_or_404(ContactInformation, student=profile)
+        return get_object_or_404(ContactInformation, student_id=get_student_profile_id(self.request))
     
     def perform_create(self, serializer):
         profile, created = StudentProfile.objects.get_or_create(user=self.request.user)
         serializer.save(student=profile)
+        profile.mark_section(StudentProfile.CONTACT)
 
-class StudentRelativeViewSet(viewsets.ModelViewSet):
+class StudentRelativeViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     serializer_class = StudentRelativeSerializer
     permission_classes = [IsApplicant]
     
     def get_queryset(self):
-        profile = get_object_or_404(StudentProfile, user=self.request.user)
-        return StudentRelative.objects.filter(student=profile)
+        return StudentRelative.objects.filter(student_id=get_student_profile_id(self.request))
     
     def perform_create(self, serializer):
         profile, created = StudentProfile.objects.get_or_create(user=self.request.user)
         serializer.save(student=profile)
 
-class EducationalBackgroundViewSet(viewsets.ModelViewSet):
+class EducationalBackgroundViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     serializer_class = EducationalBackgroundSerializer
     permission_classes = [IsApplicant]
     
     def get_queryset(self):
-        profile = get_object_or_404(StudentProfile, user=self.request.user)
-        return EducationalBackground.objects.filter(student=profile)
+        return EducationalBackground.objects.filter(
+            student_id=get_student_profile_id(self.request)
+        ).select_related('institution', 'degree')
     
     def perform_create(self, serializer):
         profile, created = StudentProfile.objects.get_or_create(user=self.request.user)
         serializer.save(student=profile)
+        profile.mark_section(StudentProfile.EDUCATION)
+    
+    def perform_destroy(self, instance):
+        profile = instance.student
+        instance.delete()
+        if not profile.educational_records.exists():
+            profile.mark_section(StudentProfile.EDUCATION, complete=False)
 
 class MedicalInformationView(generics.CreateAPIView, generics.RetrieveUpdateAPIView):
     serializer_class = MedicalInformationSerializer
     permission_classes = [IsApplicant]
     
     def get_object(self):
-        profile = get_object_or_404(StudentProfile, user=self.request.user)
-        return get_object_or_404(MedicalInformation, student=profile)
+        return get_object_or_404(MedicalInformation, student_id=get_student_profile_id(self.request))
     
     def perform_create(self, serializer):
         profile, created = StudentProfile.objects.get_or_create(user=self.request.user)
         serializer.save(student=profile)
+        profile.mark_section(StudentProfile.MEDICAL)
 
 # ==================== PROGRAM MANAGEMENT ====================
-class ProgramViewSet(viewsets.ModelViewSet):
-    queryset = Program.objects.filter(is_deleted=False)
+class ProgramViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
+    queryset = Program.objects.filter(is_deleted=False).order_by('id').prefetch_related('courses')
     serializer_class = ProgramSerializer
     
     def get_permissions(self):
@@ -139,8 +218,8 @@ class ProgramViewSet(viewsets.ModelViewSet):
             permission_classes = [IsAdmissionOfficer]
         return [permission() for permission in permission_classes]
 
-class CourseViewSet(viewsets.ModelViewSet):
-    queryset = Course.objects.filter(is_deleted=False)
+class CourseViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
+    queryset = Course.objects.filter(is_deleted=False).order_by('id')
     serializer_class = CourseSerializer
     
     def get_permissions(self):
@@ -150,7 +229,7 @@ class CourseViewSet(viewsets.ModelViewSet):
             permission_classes = [IsAdmissionOfficer]
         return [permission() for permission in permission_classes]
 
-class AcademicSessionViewSet(viewsets.ModelViewSet):
+class AcademicSessionViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = AcademicSession.objects.all()
     serializer_class = AcademicSessionSerializer
     
@@ -161,10 +240,21 @@ class AcademicSessionViewSet(viewsets.ModelViewSet):
             permission_classes = [IsAdmissionOfficer]
         return [permission() for permission in permission_classes]
 
-class OfferedProgramViewSet(viewsets.ModelViewSet):
-    queryset = OfferedProgram.objects.filter(is_active=True)
+class OfferedProgramViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
+    queryset = OfferedProgram.objects.filter(is_active=True).order_by('id').select_related('program', 'session')
     serializer_class = OfferedProgramSerializer
     
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action != 'list':
+            queryset = queryset.prefetch_related('program__courses')
+        return queryset
+    
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return OfferedProgramListSerializer
+        return OfferedProgramSerializer
+    
     def get_permissions(self):
         if self.action in ['list', 'retrieve']:
             permission_classes = [permissions.IsAuthenticated]
@@ -173,18 +263,35 @@ class OfferedProgramViewSet(viewsets.ModelViewSet):
         return [permission() for permission in permission_classes]
 
 # ==================== APPLICATION MANAGEMENT ====================
-class ApplicationViewSet(viewsets.ModelViewSet):
+def export_response(request, kind):
+    """Stream an export; see ``apps.dashboard.exports``."""
+    query = ExportQuerySerializer(data=request.query_params)
+    query.is_valid(raise_exception=True)
+    params = dict(query.validated_data)
+    filename, content_type, chunks = stream_export(kind, params.pop('file_type'), **params)
+    response = StreamingHttpResponse(chunks, content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+class ApplicationViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     serializer_class = ApplicationSerializer
+    pagination_class = ApplicationCursorPagination
     
     def get_queryset(self):
-        if self.request.user.role.role == 'applicant':
-            profile = get_object_or_404(StudentProfile, user=self.request.user)
-            return Application.objects.filter(student=profile)
-        return Application.objects.all()
+        queryset = Application.objects.all()
+        if self.request.user.role_code == 'applicant':
+            queryset = queryset.filter(student_id=get_student_profile_id(self.request))
+        if self.action == 'list':
+            queryset = ApplicationListSerializer.setup_eager_loading(queryset)
+        elif self.action == 'retrieve':
+            queryset = ApplicationSerializer.setup_eager_loading(queryset)
+        return queryset
     
     def get_serializer_class(self):
         if self.action == 'create':
             return ApplicationCreateSerializer
+        if self.action == 'list':
+            return ApplicationListSerializer
         return ApplicationSerializer
     
     def get_permissions(self):
@@ -202,19 +309,15 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         application = serializer.save(student=profile, status=submitted_status)
         
         # Create application fee payment record
-        fee_structure = FeeStructure.objects.filter(
-            program=application.program,
-            session=application.academic_session,
-            is_active=True
-        ).first()
-        
-        if fee_structure:
-            Payment.objects.create(
-                application=application,
-                payment_type='application',
-                amount=fee_structure.application_fee,
-                transaction_id=f"APP-{uuid.uuid4().hex[:8].upper()}"
-            )
+        enqueue('apps.payments.tasks.create_application_fee', application.pk)
+    
+    def perform_destroy(self, instance):
+        status_code = instance.status.code if instance.status else None
+        with transaction.atomic():
+            record_removal(instance.program_id, instance.academic_session_id, status_code)
+            release_seats([(instance.program_id, instance.academic_session_id, status_code, None)])
+            invalidate_verification([instance.verification_hash])
+            instance.delete()
     
     @action(detail=True, methods=['post'], permission_classes=[CanManageApplications])
     def update_status(self, request, pk=None):
@@ -225,66 +328,162 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         new_status = get_object_or_404(ApplicationStatus, id=serializer.validated_data['status_id'])
         old_status = application.status
         
-        application.status = new_status
-        application.updated_by = request.user
-        application.save()
+        try:
+            transition_status(
+                application,
+                new_status,
+                changed_by=request.user,
+                remarks=serializer.validated_data.get('remarks', ''),
+            )
+        except SeatsUnavailable as e:
+            return Response({'error': str(e), 'code': 'sold_out'}, status=status.HTTP_409_CONFLICT)
         
-        # Create tracking log
-        ApplicationTracking.objects.create(
-            application=application,
-            status=new_status,
+        return Response({
+            'message': f'Status updated from {old_status.name} to {new_status.name}',
+            'application': ApplicationSerializer(application).data
+        })
+    
+    @action(detail=False, methods=['post'], permission_classes=[CanManageApplications])
+    def bulk_update_status(self, request):
+        serializer = ApplicationBulkStatusUpdateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        new_status = get_object_or_404(ApplicationStatus, id=serializer.validated_data['status_id'])
+        results = bulk_update_status(
+            serializer.validated_data['application_ids'],
+            new_status,
+            changed_by=request.user,
             remarks=serializer.validated_data.get('remarks', ''),
-            changed_by=request.user
         )
         
-        # If approved, create admission fee payment
-        if new_status.code == 'approved':
-            fee_structure = FeeStructure.objects.filter(
-                program=application.program,
-                session=application.academic_session,
-                is_active=True
-            ).first()
-            
-            if fee_structure:
-                Payment.objects.get_or_create(
-                    application=application,
-                    payment_type='admission',
-                    defaults={
-                        'amount': fee_structure.admission_fee,
-                        'transaction_id': f"ADM-{uuid.uuid4().hex[:8].upper()}"
-                    }
-                )
-        
         return Response({
-            'message': f'Status updated from {old_status.name} to {new_status.name}',
-            'application': ApplicationSerializer(application).data
+            'status': new_status.code,
+            'updated': sum(1 for result in results if result['result'] == 'updated'),
+            'results': results,
         })
     
+    @action(detail=False, methods=['post'], permission_classes=[IsAdmissionOfficer])
+    def compute_merit(self, request):
+        serializer = MeritComputeSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        session = get_object_or_404(AcademicSession, id=serializer.validated_data['session_id'])
+        result = compute_merit(
+            session.id,
+            program_id=serializer.validated_data.get('program_id'),
+            weights=serializer.validated_data.get('weights'),
+            tie_breakers=serializer.validated_data.get('tie_breakers'),
+        )
+        return Response(result)
+    
+    @action(detail=False, methods=['post'], permission_classes=[IsAdmissionOfficer])
+    def allocate_seats(self, request):
+        serializer = SeatAllocationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        session = get_object_or_404(AcademicSession, id=serializer.validated_data['session_id'])
+        summary = allocate_seats(
+            session.id,
+            commit=serializer.validated_data['commit'],
+            changed_by=request.user,
+        )
+        return Response(summary)
+    
+    @action(detail=False, methods=['post'], permission_classes=[IsAdmissionOfficer])
+    def issue_letters(self, request):
+        serializer = AdmissionLetterIssueSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        session = get_object_or_404(AcademicSession, id=serializer.validated_data['session_id'])
+        issued = issue_admission_letters(session.id, issued_by=request.user)
+        enqueue(
+            'apps.applications.tasks.generate_session_admission_letters',
+            session.id,
+            force=serializer.validated_data['force'],
+        )
+        return Response({
+            'message': 'Admission letter PDFs are being generated',
+            'issued': issued,
+        }, status=status.HTTP_202_ACCEPTED)
+    
+    @action(detail=False, methods=['get'], permission_classes=[CanViewReports])
+    def export(self, request):
+        return export_response(request, 'applications')
+    
     @action(detail=True, methods=['get'])
     def tracking(self, request, pk=None):
         application = self.get_object()
-        tracking_logs = ApplicationTracking.objects.filter(application=application).order_by('-timestamp')
-        serializer = ApplicationTrackingSerializer(tracking_logs, many=True)
-        return Response(serializer.data)
+        tracking_logs = ApplicationTracking.objects.filter(application=application).select_related(
+            'status', 'changed_by__role'
+        )
+        paginator = ApplicationTrackingCursorPagination()
+        page = paginator.paginate_queryset(tracking_logs, request, view=self)
+        serializer = ApplicationTrackingSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
     
     @action(detail=False, methods=['get'], permission_classes=[CanViewReports])
     def statistics(self, request):
-        stats = Application.objects.values('status__name').annotate(count=Count('id'))
-        return Response(stats)
+        query = ApplicationStatisticsQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+        if params.get('group_by') or params.get('date_from') or params.get('date_to'):
+            return Response(get_statistics(
+                params.get('group_by') or [],
+                date_from=params.get('date_from'),
+                date_to=params.get('date_to'),
+            ))
+        
+        # Read from the AdmissionStats counters, in the original response shape
+        return Response(get_status_summary())
+
+class ApplicationVerificationView(generics.GenericAPIView):
+    """Public lookup for QR code scans; answered from the cache."""
+    permission_classes = [permissions.AllowAny]
+    authentication_classes = []
+    throttle_classes = [VerificationIPThrottle]
+    serializer_class = ApplicationVerificationSerializer
+    
+    def get(self, request, verification_hash):
+        data = get_verification(verification_hash)
+        if data is None:
+            return Response({'error': 'No application matches this verification code'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(data)
+
+class ApplicantSearchView(generics.GenericAPIView):
+    """Ranked search over applicants by name, email, CNIC, phone or application number."""
+    permission_classes = [CanManageApplications | IsDataEntry]
+    serializer_class = ApplicantSearchQuerySerializer
+    
+    def get(self, request):
+        query = ApplicantSearchQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        results = search_applicants(query.validated_data['q'], limit=query.validated_data['limit'])
+        return Response({
+            'query': query.validated_data['q'],
+            'count': len(results),
+            'results': results,
+        })
 
 # ==================== PAYMENT MANAGEMENT ====================
-class PaymentViewSet(viewsets.ModelViewSet):
+class PaymentViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     serializer_class = PaymentSerializer
+    pagination_class = PaymentCursorPagination
     
     def get_queryset(self):
-        if self.request.user.role.role == 'applicant':
-            profile = get_object_or_404(StudentProfile, user=self.request.user)
-            return Payment.objects.filter(application__student=profile)
-        return Payment.objects.all()
+        queryset = Payment.objects.all()
+        if self.request.user.role_code == 'applicant':
+            queryset = queryset.filter(application__student_id=get_student_profile_id(self.request))
+        if self.action == 'list':
+            queryset = PaymentListSerializer.setup_eager_loading(queryset)
+        elif self.action == 'retrieve':
+            queryset = PaymentSerializer.setup_eager_loading(queryset)
+        return queryset
     
     def get_serializer_class(self):
         if self.action == 'create':
             return PaymentCreateSerializer
+        if self.action == 'list':
+            return PaymentListSerializer
         return PaymentSerializer
     
     def get_permissions(self):
@@ -313,9 +512,15 @@ class PaymentViewSet(viewsets.ModelViewSet):
             'message': 'Payment verified successfully',
             'payment': PaymentSerializer(payment).data
         })
+    
+    @action(detail=False, methods=['get'], permission_classes=[IsAccountant])
+    def export(self, request):
+        return export_response(request, 'payments')
 
-class FeeStructureViewSet(viewsets.ModelViewSet):
-    queryset = FeeStructure.objects.filter(is_active=True)
+class FeeStructureViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
+    queryset = FeeStructure.objects.filter(is_active=True).select_related(
+        'program', 'session'
+    ).prefetch_related('program__courses')
     serializer_class = FeeStructureSerializer
     
     def get_permissions(self):
@@ -325,22 +530,25 @@ class FeeStructureViewSet(viewsets.ModelViewSet):
             permission_classes = [IsAdmissionOfficer]
         return [permission() for permission in permission_classes]
 
-class PaymentMethodViewSet(viewsets.ReadOnlyModelViewSet):
+class PaymentMethodViewSet(SparseFieldsetViewMixin, viewsets.ReadOnlyModelViewSet):
     queryset = PaymentMethod.objects.filter(is_active=True)
     serializer_class = PaymentMethodSerializer
     permission_classes = [permissions.IsAuthenticated]
 
 # ==================== DASHBOARD & REPORTS ====================
-class AnnouncementViewSet(viewsets.ModelViewSet):
+class AnnouncementViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     serializer_class = AnnouncementSerializer
     
     def get_queryset(self):
-        if self.request.user.role.role == 'applicant':
-            return Announcement.objects.filter(
-                Q(target_roles=self.request.user.role) | Q(target_roles__isnull=True),
+        queryset = Announcement.objects.order_by('-created_at', '-id').select_related(
+            'created_by__role'
+        ).prefetch_related('target_roles')
+        if self.request.user.role_code == 'applicant':
+            return queryset.filter(
+                Q(target_roles__role=self.request.user.role_code) | Q(target_roles__isnull=True),
                 is_active=True
             )
-        return Announcement.objects.filter(is_active=True)
+        return queryset.filter(is_active=True)
     
     def get_permissions(self):
         if self.action in ['list', 'retrieve']:
@@ -352,13 +560,15 @@ class AnnouncementViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
 
-class AdmissionStatsViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = AdmissionStats.objects.all()
+class AdmissionStatsViewSet(SparseFieldsetViewMixin, viewsets.ReadOnlyModelViewSet):
+    queryset = AdmissionStats.objects.order_by('session_id', 'program_id').select_related(
+        'program', 'session'
+    ).prefetch_related('program__courses')
     serializer_class = AdmissionStatsSerializer
     permission_classes = [CanViewReports]
 
 # ==================== LOOKUP DATA ====================
-class DegreeViewSet(viewsets.ModelViewSet):
+class DegreeViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = Degree.objects.all()
     serializer_class = DegreeSerializer
     
@@ -369,7 +579,7 @@ class DegreeViewSet(viewsets.ModelViewSet):
             permission_classes = [IsDataEntry]
         return [permission() for permission in permission_classes]
 
-class InstituteViewSet(viewsets.ModelViewSet):
+class InstituteViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = Institute.objects.all()
     serializer_class = InstituteSerializer
     
@@ -380,22 +590,22 @@ class InstituteViewSet(viewsets.ModelViewSet):
             permission_classes = [IsDataEntry]
         return [permission() for permission in permission_classes]
 
-class BloodGroupViewSet(viewsets.ReadOnlyModelViewSet):
+class BloodGroupViewSet(SparseFieldsetViewMixin, viewsets.ReadOnlyModelViewSet):
     queryset = BloodGroup.objects.all()
     serializer_class = BloodGroupSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-class DiseaseViewSet(viewsets.ReadOnlyModelViewSet):
+class DiseaseViewSet(SparseFieldsetViewMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Disease.objects.all()
     serializer_class = DiseaseSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-class ApplicationStatusViewSet(viewsets.ReadOnlyModelViewSet):
+class ApplicationStatusViewSet(SparseFieldsetViewMixin, viewsets.ReadOnlyModelViewSet):
     queryset = ApplicationStatus.objects.all()
     serializer_class = ApplicationStatusSerializer
     permission_classes = [CanManageApplications]
 
-class RoleViewSet(viewsets.ReadOnlyModelViewSet):
+class RoleViewSet(SparseFieldsetViewMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Role.objects.all()
     serializer_class = RoleSerializer
     permission_classes = [IsAdminUser]
\ No newline at end of file
@@ -0,0 +1,152 @@
+"""
+Session-wide seat allocation.
+
+Runs applicant-proposing deferred acceptance over every open application of
+an academic session: applicants propose to programs in preference order,
+each program holds its best-ranked proposals up to capacity and rejects the
+rest, until no rejected applicant has a choice left. The result is stable,
+so no applicant is placed in more than one program and nobody loses a seat
+to a lower-ranked applicant.
+
+Everything runs over compact NumPy arrays; the database is read once and,
+when committing, written with the bulk status services.
+"""
+import numpy as np
+from django.db import transaction
+
+from apps.programs.models import OfferedProgram
+from .models import Application, ApplicationStatus
+from .services import bulk_update_status
+
+EXCLUDED_STATUSES = ('rejected',)
+ALLOCATION_REMARKS = 'Seat allocation'
+
+
+def _group_starts(sorted_keys):
+    """Index of the first element of each element's run in ``sorted_keys``."""
+    starts = np.ones(len(sorted_keys), dtype=bool)
+    starts[1:] = sorted_keys[1:] != sorted_keys[:-1]
+    return np.maximum.accumulate(np.where(starts, np.arange(len(sorted_keys)), 0))
+
+
+def deferred_acceptance(students, programs, preferences, ranks, capacities):
+    """
+    Match applications to programs.
+
+    All arguments but ``capacities`` are per-application arrays: the
+    applicant, the program index, the applicant's preference (lower is
+    better) and the program's rank of the application (lower is better).
+    ``capacities`` holds the seats per program index. Returns a boolean mask
+    of matched applications and the number of rounds taken.
+    """
+    count = len(students)
+    matched = np.zeros(count, dtype=bool)
+    if not count:
+        return matched, 0
+
+    # Each applicant's applications, best preference first
+    # (applicants are numbered 0..n-1, so they index the per-applicant arrays)
+    choices = np.lexsort((ranks, preferences, students))
+    start = np.flatnonzero(_group_starts(students[choices]) == np.arange(count))
+    end = np.append(start[1:], count)
+    offset = np.zeros(len(start), dtype=np.int64)
+    pointer = choices[start]
+
+    active = np.arange(len(start))
+    held = np.empty(0, dtype=np.int64)
+    rounds = 0
+    while len(active):
+        rounds += 1
+        candidates = np.concatenate([held, pointer[active]])
+        order = np.lexsort((ranks[candidates], programs[candidates]))
+        candidates = candidates[order]
+        position = np.arange(len(candidates)) - _group_starts(programs[candidates])
+        accepted = position < capacities[programs[candidates]]
+        held = candidates[accepted]
+
+        rejected = students[candidates[~accepted]]
+        offset[rejected] += 1
+        active = rejected[start[rejected] + offset[rejected] < end[rejected]]
+        pointer[active] = choices[start[active] + offset[active]]
+
+    matched[held] = True
+    return matched, rounds
+
+
+def allocate_seats(session_id, commit=False, changed_by=None):
+    """
+    Allocate the seats of every offered program in ``session_id``.
+
+    Applicants are ordered by ``Application.preference`` (then submission
+    time); programs rank applications by ``merit_position`` (then submission
+    time), so run ``compute_merit`` first. Capacity is ``total_seats``; a
+    program without an offering is unlimited. Matched applications become
+    ``approved`` and the others ``waitlisted``; rejected applications are
+    left out.
+
+    Returns a summary with a ``changes`` list of ``{'id', 'from', 'to'}``.
+    Nothing is written unless ``commit`` is true, in which case the changes
+    are applied with ``bulk_update_status`` (demotions first, so released
+    seats are available to the approvals).
+    """
+    with transaction.atomic():
+        rows = list(
+            Application.objects.filter(academic_session_id=session_id)
+            .exclude(status__code__in=EXCLUDED_STATUSES)
+            .values_list('id', 'student_id', 'program_id', 'preference', 'merit_position', 'applied_at', 'status__code')
+            .order_by()
+        )
+        summary = {'applications': len(rows), 'students': 0, 'approved': 0, 'waitlisted': 0, 'rounds': 0, 'changes': []}
+        if not rows:
+            return summary
+
+        ids, student_ids, program_ids, preferences, merit_positions, applied_at, current = zip(*rows)
+        ids = np.array(ids, dtype=np.int64)
+        _, students = np.unique(np.array(student_ids, dtype=np.int64), return_inverse=True)
+        program_keys, programs = np.unique(np.array(program_ids, dtype=np.int64), return_inverse=True)
+        missing = np.iinfo(np.int64).max
+        preferences = np.array([missing if value is None else value for value in preferences], dtype=np.int64)
+        merit_positions = np.array([missing if value is None else value for value in merit_positions], dtype=np.int64)
+        submitted = np.array([value.timestamp() for value in applied_at], dtype=np.float64)
+
+        # Break ties by submission time, then id, so every order is strict
+        ranks = np.empty(len(ids), dtype=np.int64)
+        ranks[np.lexsort((ids, submitted, merit_positions))] = np.arange(len(ids))
+        preference_ranks = np.empty(len(ids), dtype=np.int64)
+        preference_ranks[np.lexsort((ids, submitted, preferences))] = np.arange(len(ids))
+
+        seats = dict(
+            OfferedProgram.objects.filter(
+                session_id=session_id, program_id__in=program_keys.tolist()
+            ).values_list('program_id', 'total_seats')
+        )
+        capacities = np.array([seats.get(key, len(ids)) for key in program_keys.tolist()], dtype=np.int64)
+
+        matched, rounds = deferred_acceptance(students, programs, preference_ranks, ranks, capacities)
+
+        targets = np.where(matched, 'approved', 'waitlisted').astype(object)
+        current = np.array([code or '' for code in current], dtype=object)
+        changed = np.flatnonzero(targets != current)
+        summary.update({
+            'students': int(students.max()) + 1,
+            'approved': int(matched.sum()),
+            'waitlisted': int(len(ids) - matched.sum()),
+            'rounds': rounds,
+            'changes': [
+                {'id': int(ids[index]), 'from': current[index] or None, 'to': targets[index]}
+                for index in changed.tolist()
+            ],
+        })
+
+        if commit and summary['changes']:
+            statuses = {status.code: status for status in ApplicationStatus.objects.filter(code__in=['approved', 'waitlisted'])}
+            results = []
+            for code in ('waitlisted', 'approved'):
+                application_ids = [change['id'] for change in summary['changes'] if change['to'] == code]
+                if application_ids:
+                    results += bulk_update_status(
+                        application_ids, statuses[code], changed_by=changed_by, remarks=ALLOCATION_REMARKS
+                    )
+            summary['committed'] = sum(1 for result in results if result['result'] == 'updated')
+            summary['sold_out'] = [result['id'] for result in results if result['result'] == 'sold_out']
+    return summary
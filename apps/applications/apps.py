@@ -5,4 +5,5 @@ class ApplicationsConfig(AppConfig):
     name = 'apps.applications'
 
     def ready(self):
-        import apps.applications.signals
+        # Connects the search index signal handlers
+        from . import search
@@ -0,0 +1,93 @@
+"""
+PDF rendering for application forms and admission letters.
+
+Pages are drawn with Pillow and saved in its PDF format, so no extra
+rendering dependency is needed.
+"""
+from io import BytesIO
+
+import qrcode
+from PIL import Image, ImageDraw, ImageFont
+
+from .models import VERIFICATION_URL
+
+# A4 at 150 dpi
+PAGE_SIZE = (1240, 1754)
+MARGIN = 100
+QR_SIZE = 300
+
+
+def render_qrcode(verification_hash):
+    image = qrcode.make(f"{VERIFICATION_URL}{verification_hash}").get_image()
+    return image.convert('RGB').resize((QR_SIZE, QR_SIZE))
+
+
+def render_pdf(title, rows, verification_hash, footer=''):
+    """Render a single page with a title, label/value rows and a verification QR code."""
+    page = Image.new('RGB', PAGE_SIZE, 'white')
+    draw = ImageDraw.Draw(page)
+    title_font = ImageFont.load_default(size=48)
+    font = ImageFont.load_default(size=28)
+
+    draw.text((MARGIN, MARGIN), title, fill='black', font=title_font)
+    y = MARGIN + 120
+    for label, value in rows:
+        draw.text((MARGIN, y), f"{label}:", fill='black', font=font)
+        draw.text((MARGIN + 380, y), str(value if value is not None else '-'), fill='black', font=font)
+        y += 56
+
+    page.paste(render_qrcode(verification_hash), (PAGE_SIZE[0] - MARGIN - QR_SIZE, MARGIN))
+    if footer:
+        draw.text((MARGIN, PAGE_SIZE[1] - MARGIN), footer, fill='black', font=font)
+
+    buffer = BytesIO()
+    page.save(buffer, format='PDF', resolution=150)
+    return buffer.getvalue()
+
+
+def application_rows(application):
+    student = application.student
+    personal = getattr(student, 'personalinformation', None)
+    return [
+        ('Tracking ID', application.tracking_id),
+        ('Form No', application.application_form_no),
+        ('Name', student.user.get_full_name()),
+        ("Father's Name", personal.father_name if personal else None),
+        ('CNIC', personal.cnic if personal else student.user.cnic),
+        ('Program', application.program.name),
+        ('Session', application.academic_session.session),
+        ('Applied At', application.applied_at.strftime('%d %b %Y %H:%M')),
+    ]
+
+
+def render_application_pdf(application):
+    return render_pdf(
+        'Application Form',
+        application_rows(application),
+        application.verification_hash,
+        footer='Scan the QR code to verify this application.',
+    )
+
+
+def admission_letter_rows(letter):
+    application = letter.approved_application.approved_app
+    return application_rows(application) + [
+        ('Merit Position', letter.merit_position),
+        ('Issued At', letter.issued_at.strftime('%d %b %Y')),
+    ]
+
+
+def render_admission_letter(rows, verification_hash):
+    return render_pdf(
+        'Admission Letter',
+        rows,
+        verification_hash,
+        footer='Scan the QR code to verify this admission letter.',
+    )
+
+
+def render_admission_letter_pdf(letter):
+    return render_admission_letter(
+        admission_letter_rows(letter),
+        letter.approved_application.approved_app.verification_hash,
+    )
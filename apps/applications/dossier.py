@@ -0,0 +1,59 @@
+"""
+Versions of an applicant's dossier, used for its ETag.
+
+Each section of the dossier has an ``updated_at`` column. The version of a
+single-row section is that timestamp. For multi-row sections it is the row
+count plus the latest timestamp, so deletions change it too. All versions
+come from one query, so a conditional request can be answered with a 304
+before anything else is loaded.
+"""
+import hashlib
+import json
+
+from django.db.models import Count, Max, OuterRef, Subquery
+
+from apps.payments.models import Payment
+from apps.users.models import EducationalBackground, StudentRelative
+from .models import Application
+
+# Single-row sections, read through joins
+SINGLE_SECTIONS = [
+    'updated_at',
+    'user__updated_at',
+    'personalinformation__updated_at',
+    'contactinformation__updated_at',
+    'medicalinformation__updated_at',
+]
+
+# Multi-row sections: (name, model, lookup of the student profile)
+MULTI_SECTIONS = [
+    ('relatives', StudentRelative, 'student'),
+    ('educational_records', EducationalBackground, 'student'),
+    ('applications', Application, 'student'),
+    ('payments', Payment, 'application__student'),
+]
+
+
+def _aggregate(model, student_lookup, function):
+    return Subquery(
+        model.objects.filter(**{student_lookup: OuterRef('pk')})
+        .order_by().values(student_lookup).annotate(value=function).values('value')[:1]
+    )
+
+
+def dossier_versions(profiles):
+    """Return the section versions of the single profile in ``profiles``, or ``None``."""
+    annotations = {}
+    for name, model, student_lookup in MULTI_SECTIONS:
+        annotations[f'{name}_count'] = _aggregate(model, student_lookup, Count('pk'))
+        annotations[f'{name}_updated_at'] = _aggregate(model, student_lookup, Max('updated_at'))
+    return profiles.annotate(**annotations).values('pk', *SINGLE_SECTIONS, *annotations).first()
+
+
+def dossier_etag(versions, variant=''):
+    """
+    Strong ETag for a dossier. ``variant`` distinguishes representations of
+    the same dossier, such as different ``?fields=`` selections.
+    """
+    payload = json.dumps([sorted(versions.items()), variant], default=str)
+    return '"{}"'.format(hashlib.sha256(payload.encode()).hexdigest()[:40])
@@ -0,0 +1,185 @@
+"""
+Batch issuance and rendering of admission letters.
+
+Letters are rendered in a process pool, since PDF and QR rendering is CPU
+bound. The parent process streams each finished PDF to storage as soon as
+it arrives. Each letter stores a hash of everything that goes into its
+PDF, so unchanged letters are skipped on later runs.
+"""
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import django
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.utils import timezone
+
+from .documents import admission_letter_rows, render_admission_letter
+from .models import AdmissionLetter, Application, ApplicationApproved
+
+logger = logging.getLogger(__name__)
+
+# Bump when the letter layout changes so every letter is re-rendered
+LETTER_TEMPLATE_VERSION = 1
+LETTER_SELECT_RELATED = (
+    'approved_application__approved_app__student__user',
+    'approved_application__approved_app__student__personalinformation',
+    'approved_application__approved_app__program',
+    'approved_application__approved_app__academic_session',
+)
+
+
+def letter_fingerprint(rows, verification_hash):
+    payload = json.dumps([LETTER_TEMPLATE_VERSION, rows, verification_hash], default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def letter_job(letter):
+    """Everything needed to render ``letter``, as picklable data."""
+    application = letter.approved_application.approved_app
+    rows = [(label, None if value is None else str(value)) for label, value in admission_letter_rows(letter)]
+    return {
+        'id': letter.pk,
+        'filename': f"{application.tracking_id}_admission_letter.pdf",
+        'rows': rows,
+        'verification_hash': application.verification_hash,
+        'fingerprint': letter_fingerprint(rows, application.verification_hash),
+        'current_file': letter.letter_pdf.name or '',
+    }
+
+
+def render_letter_job(job):
+    """Process pool entry point: return ``(job, pdf bytes)``."""
+    return job, render_admission_letter(job['rows'], job['verification_hash'])
+
+
+def store_letter(job, pdf):
+    """Write one rendered letter to storage and return the updated (unsaved) letter."""
+    letter = AdmissionLetter(pk=job['id'], letter_pdf=job['current_file'] or None, letter_hash=job['fingerprint'])
+    if job['current_file']:
+        letter.letter_pdf.delete(save=False)
+    letter.letter_pdf.save(job['filename'], ContentFile(pdf), save=False)
+    return letter
+
+
+def issue_admission_letters(session_id, issued_by=None):
+    """
+    Create approval records and admission letters for every approved
+    application in the session that does not have them yet.
+
+    Uses two bulk INSERTs and does not queue per-letter rendering; run
+    ``generate_admission_letters`` afterwards. Returns the number of letters created.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        approved = Application.objects.filter(
+            academic_session_id=session_id, status__code='approved'
+        ).select_for_update(of=('self',))
+        missing_approvals = approved.filter(approval__isnull=True).values_list('id', flat=True)
+        ApplicationApproved.objects.bulk_create([
+            ApplicationApproved(approved_app_id=application_id, approved_by=issued_by, approved_at=now)
+            for application_id in missing_approvals
+        ], batch_size=1000)
+        missing_letters = ApplicationApproved.objects.filter(
+            approved_app__in=approved, admission_letter__isnull=True
+        ).values_list('id', 'approved_app__merit_position')
+        letters = AdmissionLetter.objects.bulk_create([
+            AdmissionLetter(
+                approved_application_id=approval_id,
+                merit_position=merit_position,
+                issued_by=issued_by,
+                issued_at=now,
+            )
+            for approval_id, merit_position in missing_letters
+        ], batch_size=1000)
+    return len(letters)
+
+
+def generate_admission_letters(session_id=None, letter_ids=None, workers=None, force=False, progress=None):
+    """
+    Render admission letter PDFs for a session (or the given letters).
+
+    Letters whose content hash matches the stored ``letter_hash`` are skipped
+    unless ``force`` is set. ``workers`` defaults to
+    ``ADMISSION_LETTER_WORKERS`` (all cores when unset); with one worker
+    letters are rendered inline. ``progress(done, total)`` is called as
+    letters finish. Returns ``{'total', 'rendered', 'skipped', 'failed'}``.
+    """
+    workers = workers or settings.ADMISSION_LETTER_WORKERS or os.cpu_count() or 1
+    letters = AdmissionLetter.objects.select_related(*LETTER_SELECT_RELATED).order_by('pk')
+    if session_id is not None:
+        letters = letters.filter(approved_application__approved_app__academic_session_id=session_id)
+    if letter_ids is not None:
+        letters = letters.filter(pk__in=letter_ids)
+
+    summary = {'total': 0, 'rendered': 0, 'skipped': 0, 'failed': 0}
+    jobs = []
+    for letter in letters.iterator(chunk_size=1000):
+        summary['total'] += 1
+        job = letter_job(letter)
+        if not force and job['current_file'] and job['fingerprint'] == letter.letter_hash:
+            summary['skipped'] += 1
+            continue
+        jobs.append(job)
+
+    pending_updates = []
+
+    def finish(job, pdf):
+        pending_updates.append(store_letter(job, pdf))
+        summary['rendered'] += 1
+        if len(pending_updates) >= 200:
+            flush()
+
+    def flush():
+        AdmissionLetter.objects.bulk_update(pending_updates, ['letter_pdf', 'letter_hash'])
+        pending_updates.clear()
+
+    def report():
+        if progress:
+            progress(summary['rendered'] + summary['skipped'] + summary['failed'], summary['total'])
+
+    report()
+    if workers == 1 or len(jobs) <= 1:
+        for job in jobs:
+            try:
+                finish(*render_letter_job(job))
+            except Exception:
+                logger.exception('Rendering admission letter %s failed', job['id'])
+                summary['failed'] += 1
+            report()
+    else:
+        # Spawned children set Django up themselves instead of inheriting DB sockets.
+        # At most a few letters per worker are in flight so memory stays flat.
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=django.setup,
+        ) as executor:
+            queue = iter(jobs)
+            in_flight = {}
+            while True:
+                while len(in_flight) < workers * 4:
+                    job = next(queue, None)
+                    if job is None:
+                        break
+                    in_flight[executor.submit(render_letter_job, job)] = job
+                if not in_flight:
+                    break
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = in_flight.pop(future)
+                    try:
+                        finish(*future.result())
+                    except Exception:
+                        logger.exception('Rendering admission letter %s failed', job['id'])
+                        summary['failed'] += 1
+                    report()
+
+    if pending_updates:
+        flush()
+    return summary
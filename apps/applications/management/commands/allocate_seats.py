@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.applications.allocation import allocate_seats
+from apps.programs.models import AcademicSession
+
+
+class Command(BaseCommand):
+    help = 'Allocate program seats across a session by deferred acceptance (dry run unless --commit)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--session', type=int, help='Academic session id (default: current session)')
+        parser.add_argument('--commit', action='store_true', help='Apply the status changes')
+        parser.add_argument('--show-changes', action='store_true', help='List every status change')
+
+    def handle(self, *args, **options):
+        session_id = options['session']
+        if session_id is None:
+            session = AcademicSession.objects.filter(is_current=True).first()
+            if session is None:
+                raise CommandError('No current academic session; pass --session')
+            session_id = session.pk
+
+        summary = allocate_seats(session_id, commit=options['commit'])
+        if options['show_changes']:
+            for change in summary['changes']:
+                self.stdout.write(f"{change['id']}: {change['from']} -> {change['to']}")
+
+        self.stdout.write(
+            f"{summary['applications']} applications from {summary['students']} applicants, "
+            f"{summary['rounds']} rounds: {summary['approved']} approved, {summary['waitlisted']} waitlisted, "
+            f"{len(summary['changes'])} status changes"
+        )
+        if options['commit']:
+            self.stdout.write(self.style.SUCCESS(f"Committed {summary.get('committed', 0)} changes"))
+            if summary.get('sold_out'):
+                self.stdout.write(self.style.WARNING(f"{len(summary['sold_out'])} approvals found no seat"))
+        else:
+            self.stdout.write('Dry run; pass --commit to apply')
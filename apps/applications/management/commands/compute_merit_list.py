@@ -0,0 +1,42 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.applications.merit import compute_merit
+from apps.programs.models import AcademicSession
+
+
+class Command(BaseCommand):
+    help = 'Compute merit scores and positions for an academic session'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--session', type=int, help='Academic session id (default: current session)')
+        parser.add_argument('--program', type=int, help='Only rank this program')
+        parser.add_argument('--weights', help='JSON object of degree name -> weight, e.g. \'{"Matric": 0.3}\'')
+        parser.add_argument('--tie-breakers', help='Comma separated degree names used to break ties')
+
+    def handle(self, *args, **options):
+        session_id = options['session']
+        if session_id is None:
+            session = AcademicSession.objects.filter(is_current=True).first()
+            if session is None:
+                raise CommandError('No current academic session; pass --session')
+            session_id = session.pk
+
+        weights = None
+        if options['weights']:
+            try:
+                weights = json.loads(options['weights'])
+            except ValueError as e:
+                raise CommandError(f'Invalid --weights: {e}')
+        tie_breakers = None
+        if options['tie_breakers']:
+            tie_breakers = [name.strip() for name in options['tie_breakers'].split(',') if name.strip()]
+
+        started = time.monotonic()
+        result = compute_merit(session_id, program_id=options['program'], weights=weights, tie_breakers=tie_breakers)
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Ranked {result['ranked']} applications across {result['groups']} programs in {elapsed:.2f}s"
+        ))
@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.applications.letters import generate_admission_letters, issue_admission_letters
+from apps.programs.models import AcademicSession
+
+
+class Command(BaseCommand):
+    help = 'Render admission letter PDFs for a session on a process pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--session', type=int, help='Academic session id (default: current session)')
+        parser.add_argument('--issue', action='store_true',
+                            help='First create letters for approved applications that have none')
+        parser.add_argument('--workers', type=int, default=None,
+                            help='Rendering processes (default: ADMISSION_LETTER_WORKERS or all cores)')
+        parser.add_argument('--force', action='store_true', help='Re-render letters even if unchanged')
+
+    def handle(self, *args, **options):
+        session_id = options['session']
+        if session_id is None:
+            session = AcademicSession.objects.filter(is_current=True).first()
+            if session is None:
+                raise CommandError('No current academic session; pass --session')
+            session_id = session.pk
+
+        if options['issue']:
+            created = issue_admission_letters(session_id)
+            self.stdout.write(f'Issued {created} new admission letters')
+
+        started = time.monotonic()
+
+        def progress(done, total):
+            self.stdout.write(f'\r{done}/{total} letters', ending='')
+            self.stdout.flush()
+
+        summary = generate_admission_letters(
+            session_id=session_id,
+            workers=options['workers'],
+            force=options['force'],
+            progress=progress,
+        )
+        self.stdout.write('')
+        self.stdout.write(self.style.SUCCESS(
+            f"Rendered {summary['rendered']}, skipped {summary['skipped']} unchanged, "
+            f"{summary['failed']} failed in {time.monotonic() - started:.1f}s"
+        ))
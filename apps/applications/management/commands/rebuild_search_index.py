@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from apps.applications.search import reindex_students
+from apps.users.models import StudentProfile
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the applicant search index from scratch'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch', type=int, default=2000, help='Applicants reindexed per upsert')
+
+    def handle(self, *args, **options):
+        batch = options['batch']
+        ids = StudentProfile.objects.order_by('pk').values_list('pk', flat=True)
+        total = 0
+        last_id = 0
+        while True:
+            chunk = list(ids.filter(pk__gt=last_id)[:batch])
+            if not chunk:
+                break
+            total += reindex_students(chunk)
+            last_id = chunk[-1]
+            self.stdout.write(f'\r{total} applicants indexed', ending='')
+            self.stdout.flush()
+        self.stdout.write('')
+        self.stdout.write(self.style.SUCCESS(f'Search index rebuilt for {total} applicants'))
@@ -0,0 +1,142 @@
+"""
+Merit list computation.
+
+Applications of a session are loaded with their educational records into
+NumPy arrays, scored with per-degree weights and ranked per (program,
+session) in one vectorized pass. Scores and positions are written back
+with ``bulk_update``.
+"""
+import json
+import logging
+import math
+from numbers import Real
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.dashboard.models import SystemSettings
+from apps.users.models import Degree, EducationalBackground
+from .models import AdmissionLetter, Application
+
+logger = logging.getLogger(__name__)
+
+MERIT_WEIGHTS_SETTING = 'merit_degree_weights'
+
+
+def parse_merit_weights(value):
+    """``{degree name: weight}`` from a JSON object of non-negative numbers; raises ``ValueError``."""
+    weights = json.loads(value)
+    if not isinstance(weights, dict) or not weights:
+        raise ValueError('expected a non-empty JSON object')
+    for name, weight in weights.items():
+        if isinstance(weight, bool) or not isinstance(weight, Real) or not math.isfinite(weight) or weight < 0:
+            raise ValueError(f'weight for {name!r} is not a non-negative number')
+    return {name: float(weight) for name, weight in weights.items()}
+
+
+def get_merit_weights():
+    """
+    Degree weights from SystemSettings, falling back to ``MERIT_DEGREE_WEIGHTS``
+    (with a warning) when the setting is missing or malformed.
+    """
+    setting = SystemSettings.objects.filter(key=MERIT_WEIGHTS_SETTING).first()
+    if setting:
+        try:
+            return parse_merit_weights(setting.value)
+        except (TypeError, ValueError) as e:
+            logger.warning('Ignoring SystemSettings %r, using default weights: %s', MERIT_WEIGHTS_SETTING, e)
+    return settings.MERIT_DEGREE_WEIGHTS
+
+
+def rank_applications(application_ids, groups, scores, tie_breakers, applied_at):
+    """
+    Return 1-based merit positions within each group.
+
+    Sorts by group, then score (desc), then each tie-breaker column (desc),
+    then earlier ``applied_at``, then id.
+    """
+    keys = [application_ids, applied_at]
+    keys += [-column for column in reversed(tie_breakers)]
+    keys += [-scores, groups]
+    order = np.lexsort(keys)
+    sorted_groups = groups[order]
+    _, first, inverse = np.unique(sorted_groups, return_index=True, return_inverse=True)
+    positions = np.empty(len(order), dtype=np.int64)
+    positions[order] = np.arange(len(order)) - first[inverse] + 1
+    return positions
+
+
+def compute_merit(session_id, program_id=None, weights=None, tie_breakers=None):
+    """
+    Compute merit scores and positions for a session (optionally one program).
+
+    ``weights`` maps degree names to weights applied to the applicant's best
+    percentage in that degree. ``tie_breakers`` lists degree names compared
+    (highest percentage first) when scores are equal; it defaults to the
+    degrees by descending weight. Returns ``{'ranked': n, 'groups': k}``.
+    """
+    weights = weights if weights is not None else get_merit_weights()
+    if tie_breakers is None:
+        tie_breakers = sorted(weights, key=weights.get, reverse=True)
+
+    applications = Application.objects.filter(academic_session_id=session_id)
+    if program_id:
+        applications = applications.filter(program_id=program_id)
+    rows = list(applications.values_list('id', 'student_id', 'program_id', 'applied_at').order_by())
+    if not rows:
+        return {'ranked': 0, 'groups': 0}
+
+    ids, student_ids, program_ids, applied_at = zip(*rows)
+    ids = np.fromiter(ids, dtype=np.int64, count=len(rows))
+    student_ids = np.fromiter(student_ids, dtype=np.int64, count=len(rows))
+    program_ids = np.fromiter(program_ids, dtype=np.int64, count=len(rows))
+    applied_at = np.fromiter((value.timestamp() for value in applied_at), dtype=np.float64, count=len(rows))
+
+    # Best percentage per (student, degree) as a dense matrix
+    degree_names = list(dict.fromkeys(list(weights) + list(tie_breakers)))
+    degree_ids = dict(Degree.objects.filter(name__in=degree_names).values_list('name', 'id'))
+    columns = {degree_ids[name]: index for index, name in enumerate(degree_names) if name in degree_ids}
+    students, student_index = np.unique(student_ids, return_inverse=True)
+    percentages = np.zeros((len(students), len(degree_names)), dtype=np.float64)
+
+    records = EducationalBackground.objects.filter(
+        student_id__in=applications.values('student_id'),
+        degree_id__in=list(columns),
+    ).values_list('student_id', 'degree_id', 'percentage').order_by()
+    records = list(records)
+    if records:
+        rec_students, rec_degrees, rec_percentages = (np.array(column) for column in zip(*records))
+        rows_index = np.searchsorted(students, rec_students.astype(np.int64))
+        cols_index = np.array([columns[degree] for degree in rec_degrees.tolist()], dtype=np.int64)
+        np.maximum.at(percentages, (rows_index, cols_index), np.nan_to_num(rec_percentages.astype(np.float64)))
+
+    weight_vector = np.array([float(weights.get(name, 0)) for name in degree_names])
+    student_scores = percentages @ weight_vector
+    scores = np.round(student_scores[student_index], 4)
+    tie_columns = [
+        percentages[student_index, degree_names.index(name)]
+        for name in tie_breakers if name in degree_names
+    ]
+
+    positions = rank_applications(ids, program_ids, scores, tie_columns, applied_at)
+
+    now = timezone.now()
+    updates = [
+        Application(pk=int(pk), merit_score=float(score), merit_position=int(position), updated_at=now)
+        for pk, score, position in zip(ids, scores, positions)
+    ]
+    position_by_id = dict(zip(ids.tolist(), positions.tolist()))
+    letters = [
+        AdmissionLetter(pk=letter_id, merit_position=position_by_id[application_id])
+        for letter_id, application_id in AdmissionLetter.objects.filter(
+            approved_application__approved_app__in=applications
+        ).values_list('id', 'approved_application__approved_app_id')
+    ]
+
+    with transaction.atomic():
+        Application.objects.bulk_update(updates, ['merit_score', 'merit_position', 'updated_at'], batch_size=1000)
+        AdmissionLetter.objects.bulk_update(letters, ['merit_position'], batch_size=1000)
+
+    return {'ranked': len(updates), 'groups': int(len(np.unique(program_ids)))}
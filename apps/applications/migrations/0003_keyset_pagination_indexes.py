@@ -0,0 +1,25 @@
+# Generated by Django 5.2.1 on 2026-10-17 17:23
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0002_initial'),
+        ('programs', '0002_initial'),
+        ('users', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['applied_at', 'id'], name='application_applied_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicationtracking',
+            index=models.Index(fields=['timestamp', 'id'], name='tracking_timestamp_id_idx'),
+        ),
+    ]
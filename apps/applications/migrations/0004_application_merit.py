@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-17 17:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0003_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='merit_position',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='merit_score',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-17 17:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0004_application_merit'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='preference',
+            field=models.PositiveSmallIntegerField(blank=True, help_text="Applicant's ranking of this program in the session (1 = first choice)", null=True),
+        ),
+    ]
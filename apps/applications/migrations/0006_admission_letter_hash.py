@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-17 17:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0005_application_preference'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='admissionletter',
+            name='letter_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+    ]
@@ -0,0 +1,91 @@
+# Generated by Django 5.2.1 on 2026-10-17 17:42
+
+import logging
+
+import django.contrib.postgres.search
+import django.db.models.deletion
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import DatabaseError, migrations, models, transaction
+
+logger = logging.getLogger(__name__)
+
+TABLE = 'applications_applicantsearchindex'
+FTS_TABLE = 'applicant_search_fts'
+
+# PostgreSQL: a GIN index for the tsvector and trigram indexes for partial matches
+POSTGRES_SQL = [
+    f'CREATE INDEX applicant_search_vector_idx ON {TABLE} USING gin (search_vector)',
+    f'CREATE INDEX applicant_search_document_trgm_idx ON {TABLE} USING gin (document gin_trgm_ops)',
+    f'CREATE INDEX applicant_search_identifiers_trgm_idx ON {TABLE} USING gin (identifiers gin_trgm_ops)',
+]
+POSTGRES_REVERSE_SQL = [
+    'DROP INDEX IF EXISTS applicant_search_identifiers_trgm_idx',
+    'DROP INDEX IF EXISTS applicant_search_document_trgm_idx',
+    'DROP INDEX IF EXISTS applicant_search_vector_idx',
+]
+
+# SQLite: an FTS5 trigram table over the index rows, kept in sync by triggers
+SQLITE_SQL = [
+    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+    f"document, identifiers, content='{TABLE}', content_rowid='id', tokenize='trigram')",
+    f"CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON {TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, document, identifiers) VALUES (new.id, new.document, new.identifiers); END",
+    f"CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON {TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, document, identifiers) "
+    f"VALUES ('delete', old.id, old.document, old.identifiers); END",
+    f"CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE ON {TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, document, identifiers) "
+    f"VALUES ('delete', old.id, old.document, old.identifiers); "
+    f"INSERT INTO {FTS_TABLE}(rowid, document, identifiers) VALUES (new.id, new.document, new.identifiers); END",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+SQLITE_REVERSE_SQL = [
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_au',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ad',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ai',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+]
+
+
+def create_search_structures(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        for statement in POSTGRES_SQL:
+            schema_editor.execute(statement)
+    elif vendor == 'sqlite':
+        try:
+            with transaction.atomic(using=schema_editor.connection.alias):
+                for statement in SQLITE_SQL:
+                    schema_editor.execute(statement)
+        except DatabaseError:
+            logger.warning('SQLite FTS5 trigram tokenizer unavailable; search falls back to LIKE')
+
+
+def drop_search_structures(apps, schema_editor):
+    statements = {'postgresql': POSTGRES_REVERSE_SQL, 'sqlite': SQLITE_REVERSE_SQL}
+    for statement in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0006_admission_letter_hash'),
+        ('users', '0002_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.CreateModel(
+            name='ApplicantSearchIndex',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('document', models.TextField(blank=True)),
+                ('identifiers', models.TextField(blank=True)),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(editable=False, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('student', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='search_index', to='users.studentprofile')),
+            ],
+        ),
+        migrations.RunPython(create_search_structures, drop_search_structures),
+    ]
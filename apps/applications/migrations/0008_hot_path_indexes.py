@@ -0,0 +1,29 @@
+# Generated by Django 5.2.1 on 2026-10-17 17:47
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0007_applicant_search_index'),
+        ('programs', '0004_hot_path_indexes'),
+        ('users', '0002_keyset_pagination_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['program', 'academic_session', 'status'], name='application_prog_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['student', 'program', 'academic_session'], name='application_student_prog_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicationtracking',
+            index=models.Index(fields=['application', 'timestamp', 'id'], name='tracking_app_timestamp_idx'),
+        ),
+    ]
@@ -1,10 +1,12 @@
-from django.db import models
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models, transaction
 from django.utils import timezone
 from django.conf import settings
 from apps.users.models import CustomUser, StudentProfile
 from apps.programs.models import Program, AcademicSession
 from django.core.files.base import ContentFile
-from model_utils import FieldTracker
+from apps.common.tasks import enqueue
+from apps.dashboard.services import record_submission
 import qrcode
 from io import BytesIO
 import uuid
@@ -32,23 +34,44 @@ class Application(models.Model):
     application_form_no = models.CharField(max_length=50, unique=True, editable=False)
     status = models.ForeignKey(ApplicationStatus, on_delete=models.SET_NULL, null=True, default=None)
     applied_at = models.DateTimeField(default=timezone.now)
+    preference = models.PositiveSmallIntegerField(
+        null=True, blank=True, help_text="Applicant's ranking of this program in the session (1 = first choice)"
+    )
     verification_hash = models.CharField(max_length=64, unique=True, editable=False)
     application_pdf = models.FileField(upload_to='applications/pdf/', blank=True, null=True)
     application_qrcode = models.ImageField(upload_to='applications/qrcodes/', blank=True, null=True)
+    merit_score = models.FloatField(null=True, blank=True, editable=False)
+    merit_position = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
     updated_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.SET_NULL,
         null=True,
         related_name='updated_applications'
     )
-    
-    # Track changes to the status field
-    tracker = FieldTracker(['status_id'])
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['applied_at', 'id'], name='application_applied_id_idx'),
+            models.Index(fields=['program', 'academic_session', 'status'], name='application_prog_status_idx'),
+            models.Index(fields=['student', 'program', 'academic_session'], name='application_student_prog_idx'),
+        ]
 
     def generate_verification_hash(self):
-        raw_string = f"{self.tracking_id}{self.student.id}{self.program.id}{self.applied_at.timestamp()}"
+        raw_string = f"{self.tracking_id}{self.student_id}{self.program_id}{self.applied_at.timestamp()}"
         return hashlib.sha256(raw_string.encode()).hexdigest()
 
+    def generate_qrcode(self):
+        """Render the verification QR code and store it without re-saving the row."""
+        qr_data = f"{VERIFICATION_URL}{self.verification_hash}"
+        qr = qrcode.make(qr_data)
+        buffer = BytesIO()
+        qr.save(buffer, format="PNG")
+        filename = f"{self.tracking_id}_qrcode.png"
+        self.application_qrcode.save(filename, ContentFile(buffer.getvalue()), save=False)
+        buffer.close()
+        Application.objects.filter(pk=self.pk).update(application_qrcode=self.application_qrcode.name)
+
     def save(self, *args, **kwargs):
         is_new = self._state.adding
 
@@ -60,23 +83,31 @@ class Application(models.Model):
             timestamp = timezone.now().strftime('%Y%m%d%H%M%S')
             self.application_form_no = f"FORM-{timestamp}-{uuid.uuid4().hex[:6].upper()}"
 
-        if is_new:
-            super().save(*args, **kwargs)
-
+        # Hash only needs FK ids, so the row is written with a single INSERT
         if not self.verification_hash:
             self.verification_hash = self.generate_verification_hash()
-            super().save(update_fields=['verification_hash'])
-
-        # Generate QR after hash is saved
-        if not self.application_qrcode:
-            qr_data = f"{VERIFICATION_URL}{self.verification_hash}"
-            qr = qrcode.make(qr_data)
-            buffer = BytesIO()
-            qr.save(buffer, format="PNG")
-            filename = f"{self.tracking_id}_qrcode.png"
-            self.application_qrcode.save(filename, ContentFile(buffer.getvalue()), save=False)
-            buffer.close()
-            super().save(update_fields=['application_qrcode'])
+
+        if not is_new:
+            super().save(*args, **kwargs)
+        else:
+            with transaction.atomic():
+                super().save(*args, **kwargs)
+                ApplicationTracking.objects.create(
+                    application=self,
+                    status=self.status,
+                    remarks="Application submitted"
+                )
+                record_submission(
+                    self.program_id,
+                    self.academic_session_id,
+                    self.status.code if self.status else None,
+                )
+
+        # QR and PDF rendering is CPU and storage work, keep it out of the request
+        if is_new and not self.application_qrcode:
+            enqueue('apps.applications.tasks.generate_application_qrcode', self.pk)
+        if is_new and not self.application_pdf:
+            enqueue('apps.applications.tasks.generate_application_pdf', self.pk)
 
     def __str__(self):
         return f"{self.student.user.email} - {self.program.name} ({self.status})"
@@ -102,6 +133,12 @@ class ApplicationTracking(models.Model):
     )
     timestamp = models.DateTimeField(default=timezone.now)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['timestamp', 'id'], name='tracking_timestamp_id_idx'),
+            models.Index(fields=['application', 'timestamp', 'id'], name='tracking_app_timestamp_idx'),
+        ]
+
     def __str__(self):
         return f"{self.application.tracking_id} -> {self.status.name}"
     
@@ -120,6 +157,30 @@ class AdmissionLetter(models.Model):
     )
     issued_at = models.DateTimeField(default=timezone.now)
     letter_pdf = models.FileField(upload_to='admissions/letters/pdf/', blank=True, null=True)
+    letter_hash = models.CharField(max_length=64, blank=True, editable=False)
+
+    def save(self, *args, **kwargs):
+        is_new = self._state.adding
+        super().save(*args, **kwargs)
+        if is_new and not self.letter_pdf:
+            enqueue('apps.applications.tasks.generate_admission_letter_pdf', self.pk)
 
     def __str__(self):
         return f"Letter for {self.approved_application.approved_app.tracking_id}"
+
+
+class ApplicantSearchIndex(models.Model):
+    """
+    Denormalized search text for one applicant, kept in sync by
+    ``apps.applications.search``. ``document`` holds names, email and
+    application numbers; ``identifiers`` holds CNIC and phone numbers with
+    and without dashes for partial matches.
+    """
+    student = models.OneToOneField(StudentProfile, on_delete=models.CASCADE, related_name='search_index')
+    document = models.TextField(blank=True)
+    identifiers = models.TextField(blank=True)
+    search_vector = SearchVectorField(null=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Search index for student {self.student_id}"
@@ -0,0 +1,254 @@
+"""
+Applicant search.
+
+Each applicant has one ``ApplicantSearchIndex`` row. The row is rebuilt
+after commit whenever the applicant's user, personal information or
+applications change. The database indexes it as follows:
+
+* PostgreSQL: a ``tsvector`` column with a GIN index for words, and
+  trigram GIN indexes (``pg_trgm``) for partial CNIC, phone and tracking
+  number matches.
+* SQLite: an FTS5 table with the trigram tokenizer, kept in sync by
+  triggers and ranked with ``bm25``.
+
+Other databases fall back to ``LIKE`` scans. The indexes, the FTS5 table
+and its triggers are created by migration ``0007_applicant_search_index``.
+"""
+import re
+from functools import partial
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection, transaction
+from django.db.models import Case, F, FloatField, Q, Value, When
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.users.models import CustomUser, PersonalInformation, StudentProfile
+from .models import ApplicantSearchIndex, Application
+
+TABLE = ApplicantSearchIndex._meta.db_table
+FTS_TABLE = 'applicant_search_fts'
+# Fields whose changes affect the indexed text
+USER_FIELDS = {'first_name', 'last_name', 'email', 'phone', 'cnic'}
+
+
+# ==================== INDEX MAINTENANCE ====================
+def sqlite_fts_available():
+    with connection.cursor() as cursor:
+        return FTS_TABLE in connection.introspection.table_names(cursor)
+
+
+def digits(value):
+    return re.sub(r'\D', '', value or '')
+
+
+def build_documents(student_ids):
+    """Return ``{student_id: (document, identifiers)}`` using two queries."""
+    profiles = StudentProfile.objects.filter(pk__in=student_ids).values_list(
+        'id', 'user__first_name', 'user__last_name', 'user__email', 'user__phone', 'user__cnic',
+        'personalinformation__father_name', 'personalinformation__cnic',
+        'personalinformation__registered_contact',
+    )
+    numbers = {}
+    for student_id, tracking_id, form_no in Application.objects.filter(student_id__in=student_ids).values_list(
+        'student_id', 'tracking_id', 'application_form_no'
+    ):
+        numbers.setdefault(student_id, []).extend([tracking_id, form_no])
+
+    documents = {}
+    for student_id, first_name, last_name, email, phone, cnic, father_name, personal_cnic, contact in profiles:
+        words = [first_name, last_name, email, father_name] + numbers.get(student_id, [])
+        raw_identifiers = [cnic, personal_cnic, phone, contact]
+        identifiers = list(dict.fromkeys(
+            value for raw in raw_identifiers if raw for value in (raw, digits(raw)) if value
+        ))
+        documents[student_id] = (
+            ' '.join(word for word in words if word).lower(),
+            ' '.join(identifiers),
+        )
+    return documents
+
+
+def reindex_students(student_ids):
+    """Rebuild the search rows of ``student_ids`` with one upsert."""
+    student_ids = list(set(student_ids))
+    if not student_ids:
+        return 0
+    documents = build_documents(student_ids)
+    ApplicantSearchIndex.objects.bulk_create(
+        [
+            ApplicantSearchIndex(student_id=student_id, document=document, identifiers=identifiers)
+            for student_id, (document, identifiers) in documents.items()
+        ],
+        update_conflicts=True,
+        unique_fields=['student'],
+        update_fields=['document', 'identifiers', 'updated_at'],
+    )
+    if connection.vendor == 'postgresql':
+        ApplicantSearchIndex.objects.filter(student_id__in=list(documents)).update(
+            search_vector=(
+                SearchVector('document', weight='A', config='simple')
+                + SearchVector('identifiers', weight='B', config='simple')
+            )
+        )
+    return len(documents)
+
+
+def schedule_reindex(student_ids):
+    """Reindex ``student_ids`` once the current transaction commits."""
+    student_ids = [student_id for student_id in student_ids if student_id]
+    if student_ids:
+        transaction.on_commit(partial(reindex_students, student_ids))
+
+
+@receiver(post_save, sender=CustomUser, dispatch_uid='search_user_saved')
+def user_saved(sender, instance, created, update_fields=None, **kwargs):
+    if created or (update_fields is not None and not USER_FIELDS.intersection(update_fields)):
+        return
+    schedule_reindex(StudentProfile.objects.filter(user=instance).values_list('id', flat=True))
+
+
+@receiver(post_save, sender=StudentProfile, dispatch_uid='search_profile_saved')
+def profile_saved(sender, instance, created, **kwargs):
+    if created:
+        schedule_reindex([instance.pk])
+
+
+@receiver(post_save, sender=PersonalInformation, dispatch_uid='search_personal_info_saved')
+def personal_information_saved(sender, instance, **kwargs):
+    schedule_reindex([instance.student_id])
+
+
+@receiver(post_save, sender=Application, dispatch_uid='search_application_saved')
+def application_saved(sender, instance, created, **kwargs):
+    if created:
+        schedule_reindex([instance.student_id])
+
+
+@receiver(post_delete, sender=Application, dispatch_uid='search_application_deleted')
+def application_deleted(sender, instance, **kwargs):
+    schedule_reindex([instance.student_id])
+
+
+# ==================== QUERIES ====================
+def query_terms(query):
+    """Split a query into lowercase terms, adding dash-free forms of numbers."""
+    terms = []
+    for term in re.findall(r'[\w@.\-+]+', query.lower()):
+        variants = [term]
+        if digits(term) and digits(term) != term and re.fullmatch(r'[\d\-+ ]+', term):
+            variants.append(digits(term))
+        terms.append(variants)
+    return terms
+
+
+def _postgres_search(terms, limit):
+    words = [re.sub(r'[^\w]', ' ', variants[0]).split() for variants in terms]
+    raw = ' & '.join(f'{word}:*' for group in words for word in group)
+    rank = SearchRank(F('search_vector'), SearchQuery(raw, config='simple', search_type='raw')) if raw else Value(0.0)
+    match = Q(search_vector=SearchQuery(raw, config='simple', search_type='raw')) if raw else Q(pk__in=[])
+
+    identifier_match = Q()
+    for variants in terms:
+        term_match = Q()
+        for variant in variants:
+            term_match |= Q(identifiers__contains=variant) | Q(document__contains=variant)
+        identifier_match &= term_match
+
+    return list(
+        ApplicantSearchIndex.objects.filter(match | identifier_match).annotate(
+            rank=rank + Case(When(identifier_match, then=Value(1.0)), default=Value(0.0), output_field=FloatField())
+        ).order_by('-rank', '-student_id').values_list('student_id', 'rank')[:limit]
+    )
+
+
+def _sqlite_search(terms, limit):
+    # The trigram tokenizer needs at least three characters per term
+    groups = []
+    for variants in terms:
+        variants = [variant for variant in variants if len(variant) >= 3]
+        if not variants:
+            return None
+        groups.append('(' + ' OR '.join('"{}"'.format(variant.replace('"', '""')) for variant in variants) + ')')
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT s.student_id, -bm25({FTS_TABLE}) AS rank FROM {FTS_TABLE} "
+            f"JOIN {TABLE} s ON s.id = {FTS_TABLE}.rowid "
+            f"WHERE {FTS_TABLE} MATCH %s ORDER BY bm25({FTS_TABLE}) LIMIT %s",
+            [' AND '.join(groups), limit],
+        )
+        return cursor.fetchall()
+
+
+def _like_search(terms, limit):
+    condition = Q()
+    for variants in terms:
+        term_match = Q()
+        for variant in variants:
+            term_match |= Q(document__icontains=variant) | Q(identifiers__icontains=variant)
+        condition &= term_match
+    return [
+        (student_id, 0.0)
+        for student_id in ApplicantSearchIndex.objects.filter(condition).order_by('-student_id')
+        .values_list('student_id', flat=True)[:limit]
+    ]
+
+
+def search_applicants(query, limit=20):
+    """
+    Return up to ``limit`` applicants matching every term of ``query``,
+    best match first, with their applications.
+    """
+    terms = query_terms(query)
+    if not terms:
+        return []
+
+    hits = None
+    if connection.vendor == 'postgresql':
+        hits = _postgres_search(terms, limit)
+    elif connection.vendor == 'sqlite' and sqlite_fts_available():
+        hits = _sqlite_search(terms, limit)
+    if hits is None:
+        hits = _like_search(terms, limit)
+    if not hits:
+        return []
+
+    student_ids = [student_id for student_id, _ in hits]
+    profiles = {
+        row['id']: row
+        for row in StudentProfile.objects.filter(pk__in=student_ids).values(
+            'id', 'user_id', 'user__first_name', 'user__last_name', 'user__email', 'user__phone', 'user__cnic',
+            'personalinformation__father_name', 'personalinformation__cnic',
+        )
+    }
+    applications = {}
+    for row in Application.objects.filter(student_id__in=student_ids).order_by('-applied_at').values(
+        'id', 'student_id', 'tracking_id', 'application_form_no', 'program__name',
+        'academic_session__session', 'status__code',
+    ):
+        applications.setdefault(row.pop('student_id'), []).append({
+            'id': row['id'],
+            'tracking_id': row['tracking_id'],
+            'application_form_no': row['application_form_no'],
+            'program': row['program__name'],
+            'session': row['academic_session__session'],
+            'status': row['status__code'],
+        })
+
+    results = []
+    for student_id, rank in hits:
+        profile = profiles.get(student_id)
+        if profile is None:
+            continue
+        results.append({
+            'student_id': student_id,
+            'user_id': profile['user_id'],
+            'name': f"{profile['user__first_name']} {profile['user__last_name']}".strip(),
+            'email': profile['user__email'],
+            'phone': profile['user__phone'],
+            'cnic': profile['personalinformation__cnic'] or profile['user__cnic'],
+            'father_name': profile['personalinformation__father_name'],
+            'rank': round(float(rank or 0), 4),
+            'applications': applications.get(student_id, []),
+        })
+    return results
@@ -0,0 +1,187 @@
+import uuid
+from collections import Counter
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.dashboard.services import record_status_changes
+from apps.payments.models import FeeStructure, Payment
+from apps.programs.services import SeatsUnavailable, release_seats, reserve_seats
+from .models import Application, ApplicationTracking
+from .verification import invalidate_verification
+
+
+def create_admission_fees(applications):
+    """
+    Create missing admission fee records for approved applications.
+
+    ``applications`` are dicts (or objects) exposing ``id``, ``program_id`` and
+    ``academic_session_id``. Costs two SELECTs and one bulk INSERT.
+    """
+    applications = [
+        app if isinstance(app, dict) else {
+            'id': app.pk, 'program_id': app.program_id, 'academic_session_id': app.academic_session_id,
+        }
+        for app in applications
+    ]
+    if not applications:
+        return []
+    fees = {
+        (fee.program_id, fee.session_id): fee.admission_fee
+        for fee in FeeStructure.objects.filter(
+            program_id__in={app['program_id'] for app in applications},
+            session_id__in={app['academic_session_id'] for app in applications},
+            is_active=True,
+        )
+    }
+    already_billed = set(
+        Payment.objects.filter(
+            application_id__in=[app['id'] for app in applications],
+            payment_type='admission',
+        ).values_list('application_id', flat=True)
+    )
+    payments = [
+        Payment(
+            application_id=app['id'],
+            payment_type='admission',
+            amount=fees[(app['program_id'], app['academic_session_id'])],
+            transaction_id=f"ADM-{uuid.uuid4().hex[:8].upper()}",
+        )
+        for app in applications
+        if app['id'] not in already_billed and (app['program_id'], app['academic_session_id']) in fees
+    ]
+    return Payment.objects.bulk_create(payments)
+
+
+def transition_status(application, new_status, changed_by=None, remarks=''):
+    """
+    Move one application to ``new_status`` and record exactly one tracking row.
+
+    Approval takes a seat on the offering first and raises
+    ``SeatsUnavailable`` when it is sold out. Returns the tracking row, or
+    ``None`` when the status did not change. Use ``bulk_update_status`` for
+    batches.
+    """
+    if application.status_id == new_status.pk:
+        return None
+
+    key = (application.program_id, application.academic_session_id)
+    with transaction.atomic():
+        # Re-read the status under a row lock so concurrent transitions of the
+        # same application run one after the other and only one of them applies
+        current = Application.objects.select_for_update(of=('self',)).filter(
+            pk=application.pk
+        ).values('status_id', 'status__code').first()
+        if current is None or current['status_id'] == new_status.pk:
+            return None
+        old_code = current['status__code']
+        changes = [key + (old_code, new_status.code)]
+        if new_status.code == 'approved' and old_code != 'approved':
+            if not reserve_seats({key: 1})[key]:
+                raise SeatsUnavailable(f"No seats left for {application.program} in this session")
+        now = timezone.now()
+        Application.objects.filter(pk=application.pk).update(
+            status=new_status, updated_by=changed_by, updated_at=now
+        )
+        record_status_changes(changes)
+        release_seats(changes)
+        invalidate_verification([application.verification_hash])
+        application.status = new_status
+        application.updated_by = changed_by
+        application.updated_at = now
+        tracking = ApplicationTracking.objects.create(
+            application=application,
+            status=new_status,
+            remarks=remarks,
+            changed_by=changed_by,
+        )
+        if new_status.code == 'approved':
+            create_admission_fees([application])
+    return tracking
+
+
+def bulk_update_status(application_ids, new_status, changed_by=None, remarks=''):
+    """
+    Move many applications to ``new_status`` in one transaction.
+
+    Uses one UPDATE for the status change, one bulk INSERT for tracking rows
+    and, on approval, one bulk INSERT for admission fees. Approvals take seats
+    in request order; applications beyond an offering's capacity are left
+    untouched. Returns a list of ``{'id', 'result', 'previous_status'}`` dicts
+    in request order, where result is ``updated``, ``unchanged``,
+    ``sold_out`` or ``not_found``.
+    """
+    application_ids = list(dict.fromkeys(application_ids))
+    now = timezone.now()
+    sold_out = set()
+
+    with transaction.atomic():
+        rows = {
+            row['id']: row
+            for row in Application.objects.select_for_update(of=('self',)).filter(pk__in=application_ids).values(
+                'id', 'status_id', 'status__code', 'program_id', 'academic_session_id', 'verification_hash'
+            )
+        }
+        changed = [
+            rows[application_id] for application_id in application_ids
+            if application_id in rows and rows[application_id]['status_id'] != new_status.pk
+        ]
+
+        if new_status.code == 'approved':
+            wanted = Counter(
+                (row['program_id'], row['academic_session_id'])
+                for row in changed if row['status__code'] != 'approved'
+            )
+            granted = reserve_seats(wanted)
+            admitted = []
+            for row in changed:
+                key = (row['program_id'], row['academic_session_id'])
+                if row['status__code'] != 'approved' and not granted[key]:
+                    sold_out.add(row['id'])
+                    continue
+                granted[key] -= 1
+                admitted.append(row)
+            changed = admitted
+
+        changed_ids = [row['id'] for row in changed]
+        if changed_ids:
+            Application.objects.filter(pk__in=changed_ids).update(
+                status=new_status, updated_by=changed_by, updated_at=timezone.now()
+            )
+            changes = [
+                (row['program_id'], row['academic_session_id'], row['status__code'], new_status.code)
+                for row in changed
+            ]
+            record_status_changes(changes)
+            release_seats(changes)
+            invalidate_verification([row['verification_hash'] for row in changed])
+            ApplicationTracking.objects.bulk_create([
+                ApplicationTracking(
+                    application_id=application_id,
+                    status=new_status,
+                    remarks=remarks,
+                    changed_by=changed_by,
+                    timestamp=now,
+                )
+                for application_id in changed_ids
+            ])
+            if new_status.code == 'approved':
+                create_admission_fees(changed)
+
+    results = []
+    for application_id in application_ids:
+        row = rows.get(application_id)
+        if row is None:
+            result = 'not_found'
+        elif application_id in sold_out:
+            result = 'sold_out'
+        elif row['status_id'] == new_status.pk:
+            result = 'unchanged'
+        else:
+            result = 'updated'
+        results.append({
+            'id': application_id,
+            'result': result,
+            'previous_status': row['status__code'] if row else None,
+        })
+    return results
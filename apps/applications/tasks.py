@@ -0,0 +1,42 @@
+import logging
+
+from django.core.files.base import ContentFile
+
+from .documents import render_application_pdf
+from .letters import generate_admission_letters
+from .models import Application
+
+logger = logging.getLogger(__name__)
+
+
+def generate_application_qrcode(application_id):
+    application = Application.objects.filter(pk=application_id).first()
+    if application and not application.application_qrcode:
+        application.generate_qrcode()
+
+
+def generate_application_pdf(application_id):
+    application = Application.objects.select_related(
+        'student__user', 'student__personalinformation', 'program', 'academic_session'
+    ).filter(pk=application_id).first()
+    if not application:
+        return
+    application.application_pdf.save(
+        f"{application.tracking_id}_application.pdf",
+        ContentFile(render_application_pdf(application)),
+        save=False,
+    )
+    Application.objects.filter(pk=application.pk).update(application_pdf=application.application_pdf.name)
+
+
+def generate_admission_letter_pdf(letter_id):
+    generate_admission_letters(letter_ids=[letter_id], workers=1)
+
+
+def generate_session_admission_letters(session_id, force=False):
+    """Render all letters of a session on a process pool, logging progress."""
+    def progress(done, total):
+        if total and (done == total or done % 100 == 0):
+            logger.info('Admission letters for session %s: %s/%s', session_id, done, total)
+
+    return generate_admission_letters(session_id=session_id, force=force, progress=progress)
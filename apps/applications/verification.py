@@ -0,0 +1,64 @@
+"""
+Public verification of applications by the hash encoded in their QR code.
+
+Lookups are served from the cache. Known hashes are cached until the
+application's status changes (callers invalidate explicitly); unknown hashes
+are cached briefly so bursts of bad scans do not reach the database.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Application
+
+VERIFICATION_KEY_PREFIX = 'verification:'
+# Cached for unknown hashes; distinguishes "not found" from a cache miss
+NOT_FOUND = 0
+
+
+def verification_key(verification_hash):
+    return f"{VERIFICATION_KEY_PREFIX}{verification_hash}"
+
+
+def load_verification(verification_hash):
+    row = Application.objects.filter(verification_hash=verification_hash).values(
+        'tracking_id',
+        'program__name',
+        'academic_session__session',
+        'status__code',
+        'status__name',
+        'student__user__first_name',
+        'student__user__last_name',
+    ).first()
+    if row is None:
+        return None
+    return {
+        'tracking_id': row['tracking_id'],
+        'name': f"{row['student__user__first_name']} {row['student__user__last_name']}".strip(),
+        'program': row['program__name'],
+        'session': row['academic_session__session'],
+        'status': row['status__code'],
+        'status_name': row['status__name'],
+    }
+
+
+def get_verification(verification_hash):
+    """Return the public projection for ``verification_hash``, or ``None``."""
+    key = verification_key(verification_hash)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached or None
+
+    data = load_verification(verification_hash)
+    if data is None:
+        cache.set(key, NOT_FOUND, settings.VERIFICATION_NEGATIVE_CACHE_TIMEOUT)
+    else:
+        cache.set(key, data, settings.VERIFICATION_CACHE_TIMEOUT)
+    return data
+
+
+def invalidate_verification(verification_hashes):
+    """Drop cached lookups once the current transaction commits."""
+    keys = [verification_key(value) for value in verification_hashes if value]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
@@ -1,3 +1,10 @@
 from django.contrib import admin
+from django.apps import apps
 
-# Register your models here.
+app_models = apps.get_app_config('common').get_models()
+
+for model in app_models:
+    try:
+        admin.site.register(model)
+    except admin.sites.AlreadyRegistered:
+        pass
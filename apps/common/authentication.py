@@ -0,0 +1,132 @@
+"""
+JWT authentication from signed claims.
+
+Tokens carry the user's role code, student profile id and token version.
+``ClaimsJWTAuthentication`` checks the version against a cached copy and
+returns a ``ClaimsUser``, so permission checks and queryset scoping run
+without loading the user. Bumping ``CustomUser.token_version`` rejects every
+token issued before the bump; ``CustomUser.save`` does so whenever the role,
+active flag or password changes, and ``revoke_tokens`` does it explicitly.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils.functional import SimpleLazyObject
+from django.utils.translation import gettext_lazy as _
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+from apps.users.models import CustomUser, StudentProfile
+
+ROLE_CLAIM = 'role'
+STUDENT_PROFILE_CLAIM = 'student_profile_id'
+TOKEN_VERSION_CLAIM = 'token_version'
+TOKEN_VERSION_KEY_PREFIX = 'token_version:'
+
+
+def token_version_key(user_id):
+    return f"{TOKEN_VERSION_KEY_PREFIX}{user_id}"
+
+
+def cache_token_version(user_id, version):
+    cache.set(token_version_key(user_id), version, settings.TOKEN_VERSION_CACHE_TIMEOUT)
+
+
+def get_token_version(user_id):
+    """Current token version of an active user, or ``None``."""
+    version = cache.get(token_version_key(user_id))
+    if version is None:
+        version = CustomUser.objects.filter(pk=user_id, is_active=True).values_list(
+            'token_version', flat=True
+        ).first()
+        if version is not None:
+            cache_token_version(user_id, version)
+    return version
+
+
+def revoke_tokens(user_ids):
+    """Invalidate every token issued to ``user_ids`` so far."""
+    user_ids = list(user_ids)
+    CustomUser.objects.filter(pk__in=user_ids).update(token_version=F('token_version') + 1)
+    forget_token_versions(user_ids)
+
+
+def forget_token_versions(user_ids):
+    keys = [token_version_key(user_id) for user_id in user_ids]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def set_token_claims(token, user):
+    token[ROLE_CLAIM] = user.role_code
+    token[STUDENT_PROFILE_CLAIM] = user.student_profile_id
+    token[TOKEN_VERSION_CLAIM] = user.token_version
+
+
+class ClaimsUser(SimpleLazyObject):
+    """
+    The requesting user as described by a token.
+
+    ``pk``, ``role_code`` and ``student_profile_id`` come from the claims;
+    any other attribute loads the ``CustomUser`` row on first use.
+    """
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, token):
+        user_id = token[api_settings.USER_ID_CLAIM]
+        super().__init__(lambda: CustomUser.objects.select_related('role').get(pk=user_id))
+        self.__dict__['_claims'] = {
+            'pk': user_id,
+            'role_code': token[ROLE_CLAIM],
+            'student_profile_id': token[STUDENT_PROFILE_CLAIM],
+        }
+
+    def __bool__(self):
+        return True
+
+    @property
+    def pk(self):
+        return self._claims['pk']
+
+    id = pk
+
+    @property
+    def role_code(self):
+        return self._claims['role_code']
+
+    @property
+    def student_profile_id(self):
+        # Applicants usually create their profile after logging in
+        if self._claims['student_profile_id'] is None:
+            self._claims['student_profile_id'] = StudentProfile.objects.filter(
+                user_id=self.pk
+            ).values_list('pk', flat=True).first()
+        return self._claims['student_profile_id']
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """``JWTAuthentication`` that trusts the token's claims instead of loading the user."""
+
+    def get_user(self, validated_token):
+        if TOKEN_VERSION_CLAIM not in validated_token:
+            # Issued before claims were added
+            return super().get_user(validated_token)
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+
+        version = get_token_version(user_id)
+        if version is None:
+            raise AuthenticationFailed(_("User not found or inactive"), code="user_inactive")
+        if validated_token[TOKEN_VERSION_CLAIM] != version:
+            raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+        return ClaimsUser(validated_token)
+
+
+class ClaimsJWTScheme(SimpleJWTScheme):
+    """Documents ``ClaimsJWTAuthentication`` as the usual bearer scheme."""
+    target_class = 'apps.common.authentication.ClaimsJWTAuthentication'
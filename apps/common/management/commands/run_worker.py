@@ -0,0 +1,64 @@
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from apps.common.tasks import claim_jobs, execute_job
+
+
+def execute_in_thread(job_id):
+    try:
+        return execute_job(job_id)
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs (QR codes, PDFs, fee records)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4, help='Number of worker threads or processes')
+        parser.add_argument('--pool', choices=['thread', 'process'], default='thread',
+                            help='Use a thread pool for I/O bound jobs or a process pool for CPU bound ones')
+        parser.add_argument('--batch', type=int, default=None, help='Jobs claimed per poll (default: 2 x workers)')
+        parser.add_argument('--sleep', type=float, default=1.0, help='Seconds to wait when the queue is empty')
+        parser.add_argument('--once', action='store_true', help='Exit once the queue is drained')
+
+    def handle(self, *args, **options):
+        workers = options['workers']
+        batch = options['batch'] or workers * 2
+
+        if options['pool'] == 'process':
+            # Spawned children set Django up themselves instead of inheriting DB sockets
+            executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=django.setup,
+            )
+            runner = execute_job
+        else:
+            executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='job-worker')
+            runner = execute_in_thread
+
+        self.stdout.write(f"Worker started ({options['pool']} pool, {workers} workers)")
+        processed = 0
+        try:
+            while True:
+                job_ids = claim_jobs(batch)
+                if not job_ids:
+                    if options['once']:
+                        break
+                    time.sleep(options['sleep'])
+                    continue
+                futures = [executor.submit(runner, job_id) for job_id in job_ids]
+                wait(futures)
+                processed += len(job_ids)
+        except KeyboardInterrupt:
+            self.stdout.write('Shutting down worker...')
+        finally:
+            executor.shutdown(wait=True)
+
+        self.stdout.write(self.style.SUCCESS(f'Processed {processed} jobs'))
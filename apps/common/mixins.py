@@ -0,0 +1,124 @@
+from rest_framework import serializers
+
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+
+
+def _parse_paths(value):
+    return [tuple(part for part in item.strip().split('.') if part)
+            for item in value.split(',') if item.strip()]
+
+
+def get_sparse_paths(request):
+    """Return the (fields, omit) dotted paths requested on a read-only request."""
+    if request is None or request.method not in ('GET', 'HEAD'):
+        return None, None
+    params = request.query_params
+    fields = _parse_paths(params[FIELDS_PARAM]) if params.get(FIELDS_PARAM) else None
+    omit = _parse_paths(params[OMIT_PARAM]) if params.get(OMIT_PARAM) else None
+    return fields, omit
+
+
+class SparseFieldsetMixin:
+    """
+    Serializer mixin honouring ``?fields=`` and ``?omit=`` on read requests.
+
+    Both parameters take comma separated field names; dotted paths reach
+    into nested serializers (``?fields=id,student.user.email``). Serializers
+    may declare ``sparse_field_sources`` to map method fields to the
+    relations they read, so the matching query work is kept.
+    """
+    sparse_field_sources = {}
+
+    def _sparse_path(self):
+        parts = []
+        node = self
+        while node.parent is not None:
+            if node.field_name:
+                parts.append(node.field_name)
+            node = node.parent
+        return tuple(reversed(parts))
+
+    def get_fields(self):
+        fields = super().get_fields()
+        requested, omitted = get_sparse_paths(self.context.get('request'))
+        if not requested and not omitted:
+            return fields
+
+        path = self._sparse_path()
+        depth = len(path)
+        if requested and not any(len(item) <= depth and path[:len(item)] == item for item in requested):
+            wanted = {item[depth] for item in requested if len(item) > depth and item[:depth] == path}
+            for name in list(fields):
+                if name not in wanted:
+                    fields.pop(name)
+        if omitted:
+            for item in omitted:
+                if len(item) == depth + 1 and item[:depth] == path:
+                    fields.pop(item[depth], None)
+        return fields
+
+
+def _collect_sources(serializer, prefix, sources):
+    extra = getattr(serializer, 'sparse_field_sources', {})
+    for name, field in serializer.fields.items():
+        for source in extra.get(name, ()):
+            parts = source.split('__')
+            for i in range(1, len(parts) + 1):
+                sources.add(prefix + '__'.join(parts[:i]))
+        if field.source == '*':
+            path = prefix
+        else:
+            attrs = field.source_attrs
+            for i in range(1, len(attrs) + 1):
+                sources.add(prefix + '__'.join(attrs[:i]))
+            path = prefix + '__'.join(attrs) + '__'
+        if isinstance(field, serializers.ListSerializer):
+            field = field.child
+        if isinstance(field, serializers.BaseSerializer):
+            _collect_sources(field, path, sources)
+
+
+def _prune_select_related(tree, prefix, sources):
+    paths = []
+    for name, children in tree.items():
+        path = prefix + name
+        if path in sources:
+            nested = _prune_select_related(children, path + '__', sources)
+            paths.extend(nested or [path])
+    return paths
+
+
+class SparseFieldsetViewMixin:
+    """
+    ViewSet mixin that drops ``select_related``/``prefetch_related`` work for
+    relations excluded by ``?fields=`` or ``?omit=``.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        requested, omitted = get_sparse_paths(self.request)
+        if not requested and not omitted:
+            return queryset
+        serializer = self.get_serializer()
+        if not isinstance(serializer, SparseFieldsetMixin):
+            return queryset
+
+        sources = set()
+        _collect_sources(serializer, '', sources)
+
+        lookups = queryset._prefetch_related_lookups
+        if lookups:
+            kept = [
+                lookup for lookup in lookups
+                if getattr(lookup, 'prefetch_through', lookup) in sources
+            ]
+            queryset = queryset.prefetch_related(None).prefetch_related(*kept)
+
+        select_related = queryset.query.select_related
+        if isinstance(select_related, dict):
+            queryset = queryset.select_related(None)
+            kept = _prune_select_related(select_related, '', sources)
+            if kept:
+                queryset = queryset.select_related(*kept)
+        return queryset
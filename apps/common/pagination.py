@@ -0,0 +1,28 @@
+from rest_framework.pagination import CursorPagination
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination over a stable ``(timestamp, id)`` ordering.
+
+    Deep pages are a range scan on a composite index instead of an OFFSET
+    scan, and no ``COUNT(*)`` is issued. Subclasses set ``ordering`` to match
+    an index declared on the model.
+    """
+    ordering = ('-created_at', '-id')
+
+
+class ApplicationCursorPagination(KeysetPagination):
+    ordering = ('-applied_at', '-id')
+
+
+class PaymentCursorPagination(KeysetPagination):
+    ordering = ('-created_at', '-id')
+
+
+class ApplicationTrackingCursorPagination(KeysetPagination):
+    ordering = ('-timestamp', '-id')
+
+
+class UserCursorPagination(KeysetPagination):
+    ordering = ('-date_joined', '-id')
@@ -0,0 +1,176 @@
+"""
+Deferred execution for work that should not run inside a request.
+
+Tasks are referenced by dotted path so a backend can hand them to another
+thread or process. ``BACKGROUND_TASK_BACKEND`` selects the backend:
+
+* ``DatabaseBackend`` stores jobs in ``BackgroundJob`` inside the caller's
+  transaction; ``manage.py run_worker`` claims and executes them.
+* ``ThreadBackend`` runs jobs on an in-process thread pool after commit.
+* ``ImmediateBackend`` runs jobs inline (eager mode for tests).
+"""
+import logging
+import threading
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import BackgroundJob
+
+logger = logging.getLogger(__name__)
+
+
+def run_task(path, args=(), kwargs=None):
+    return import_string(path)(*args, **(kwargs or {}))
+
+
+class ImmediateBackend:
+    """Runs tasks inline. Used by the test settings."""
+
+    def submit(self, path, args, kwargs):
+        run_task(path, args, kwargs)
+
+
+class ThreadBackend:
+    """Runs tasks on an in-process thread pool once the transaction commits."""
+
+    def __init__(self):
+        self.executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'BACKGROUND_TASK_THREADS', 2),
+            thread_name_prefix='background-task',
+        )
+
+    def submit(self, path, args, kwargs):
+        transaction.on_commit(lambda: self.executor.submit(self._run, path, args, kwargs))
+
+    def _run(self, path, args, kwargs):
+        try:
+            run_task(path, args, kwargs)
+        except Exception:
+            logger.exception('Background task %s failed', path)
+        finally:
+            connections.close_all()
+
+
+class DatabaseBackend:
+    """Queues tasks as ``BackgroundJob`` rows for ``run_worker`` to execute."""
+
+    def submit(self, path, args, kwargs):
+        BackgroundJob.objects.create(
+            task=path,
+            args=list(args),
+            kwargs=kwargs,
+            max_attempts=settings.BACKGROUND_JOB_MAX_ATTEMPTS,
+        )
+
+
+_backend = None
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        _backend = import_string(settings.BACKGROUND_TASK_BACKEND)()
+    return _backend
+
+
+def enqueue(path, *args, **kwargs):
+    """Schedule the callable at ``path`` to run outside the current request."""
+    get_backend().submit(path, args, kwargs)
+
+
+# ==================== WORKER ====================
+# SQLite has no row locks; serialize claims within a worker process instead.
+_claim_lock = threading.Lock()
+
+
+def claim_jobs(limit=10):
+    """
+    Claim up to ``limit`` runnable jobs and return their ids.
+
+    Postgres claims with ``SELECT ... FOR UPDATE SKIP LOCKED`` so concurrent
+    workers never wait on each other. Other databases fall back to a process
+    lock plus a conditional UPDATE, keeping only rows that carry our token.
+    Jobs left ``running`` past ``BACKGROUND_JOB_TIMEOUT`` are reclaimed
+    while they have attempts left, and marked failed once they do not.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.BACKGROUND_JOB_TIMEOUT)
+    token = uuid.uuid4().hex
+    BackgroundJob.objects.filter(
+        status='running', locked_at__lt=stale, attempts__gte=F('max_attempts')
+    ).update(
+        status='failed',
+        finished_at=now,
+        locked_by='',
+        locked_at=None,
+        last_error=f"Worker did not finish within {settings.BACKGROUND_JOB_TIMEOUT}s on the last attempt",
+    )
+    runnable = Q(status='queued', run_after__lte=now) | Q(
+        status='running', locked_at__lt=stale, attempts__lt=F('max_attempts')
+    )
+    queryset = BackgroundJob.objects.filter(runnable).order_by('run_after', 'id')
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            ids = list(
+                queryset.select_for_update(skip_locked=True).values_list('id', flat=True)[:limit]
+            )
+            BackgroundJob.objects.filter(id__in=ids).update(
+                status='running', locked_by=token, locked_at=now, attempts=F('attempts') + 1
+            )
+        return ids
+
+    with _claim_lock:
+        ids = list(queryset.values_list('id', flat=True)[:limit])
+        BackgroundJob.objects.filter(runnable, id__in=ids).update(
+            status='running', locked_by=token, locked_at=now, attempts=F('attempts') + 1
+        )
+    return list(BackgroundJob.objects.filter(locked_by=token).values_list('id', flat=True))
+
+
+def retry_delay(attempts):
+    """Exponential backoff: base, 2 * base, 4 * base, ..."""
+    return timedelta(seconds=settings.BACKGROUND_JOB_RETRY_DELAY * 2 ** max(attempts - 1, 0))
+
+
+def execute_job(job_id):
+    """Run one claimed job and record the outcome. Safe to call from any worker."""
+    job = BackgroundJob.objects.get(pk=job_id)
+    try:
+        run_task(job.task, job.args, job.kwargs)
+    except Exception:
+        error = traceback.format_exc()
+        logger.exception('Background job %s (%s) failed', job.pk, job.task)
+        if job.attempts < job.max_attempts:
+            BackgroundJob.objects.filter(pk=job.pk).update(
+                status='queued',
+                run_after=timezone.now() + retry_delay(job.attempts),
+                locked_by='',
+                locked_at=None,
+                last_error=error,
+            )
+        else:
+            BackgroundJob.objects.filter(pk=job.pk).update(
+                status='failed', finished_at=timezone.now(), last_error=error
+            )
+        return False
+    BackgroundJob.objects.filter(pk=job.pk).update(
+        status='done', finished_at=timezone.now(), last_error=''
+    )
+    return True
+
+
+def run_pending(limit=100):
+    """Claim and run queued jobs inline. Returns the number of jobs executed."""
+    ids = claim_jobs(limit)
+    for job_id in ids:
+        execute_job(job_id)
+    return len(ids)
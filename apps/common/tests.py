@@ -1,3 +1,83 @@
+from django.core.cache import cache
 from django.test import TestCase
+from rest_framework import status
+from rest_framework.settings import api_settings
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from apps.common.throttling import parse_rate
+from apps.users.models import CustomUser, Role
+
+
+class RefreshTokenReuseTests(TestCase):
+    """A refresh token can be rotated once; reusing it is refused."""
+
+    def setUp(self):
+        cache.clear()
+        CustomUser.objects.create_user(
+            email='reviewer@example.com', password='password123',
+            role=Role.objects.create(role='reviewer'),
+        )
+        self.client = APIClient()
+        response = self.client.post(
+            '/api/v1/auth/login/', {'email': 'reviewer@example.com', 'password': 'password123'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.refresh = response.data['refresh']
+
+    def refresh_token(self, token):
+        return self.client.post('/api/v1/auth/refresh/', {'refresh': token})
+
+    def test_refresh_token_is_single_use(self):
+        response = self.refresh_token(self.refresh)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('access', response.data)
+        self.assertNotEqual(response.data['refresh'], self.refresh)
+
+        self.assertEqual(self.refresh_token(self.refresh).status_code, status.HTTP_401_UNAUTHORIZED)
+        # The rotated token still works once
+        self.assertEqual(self.refresh_token(response.data['refresh']).status_code, status.HTTP_200_OK)
+
+    def test_reuse_is_refused_after_cache_flush(self):
+        self.assertEqual(self.refresh_token(self.refresh).status_code, status.HTTP_200_OK)
+        cache.clear()
+        self.assertEqual(self.refresh_token(self.refresh).status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class LoginThrottleTests(TestCase):
+    """Repeated failed logins for one account are refused with 429."""
+
+    def setUp(self):
+        cache.clear()
+        CustomUser.objects.create_user(
+            email='reviewer@example.com', password='password123',
+            role=Role.objects.create(role='reviewer'),
+        )
+        self.client = APIClient()
+
+    def login(self, password):
+        return self.client.post('/api/v1/auth/login/', {'email': 'reviewer@example.com', 'password': password})
+
+    def test_login_throttled_after_configured_failures(self):
+        attempts, _ = parse_rate(api_settings.DEFAULT_THROTTLE_RATES['login_account'])
+        for _ in range(attempts):
+            self.assertEqual(self.login('wrong-password').status_code, status.HTTP_401_UNAUTHORIZED)
+
+        response = self.login('password123')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', response)
+
+
+class VerificationThrottleTests(TestCase):
+    """QR verification has its own per-IP budget instead of the anonymous one."""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_verification_not_limited_by_anon_budget(self):
+        anon, _ = parse_rate(api_settings.DEFAULT_THROTTLE_RATES['anon'])
+        verify, _ = parse_rate(api_settings.DEFAULT_THROTTLE_RATES['verify_ip'])
+        self.assertGreater(verify, anon)
+        client = APIClient()
+        for _ in range(anon + 1):
+            response = client.get('/api/v1/verify/unknown/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
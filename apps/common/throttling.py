@@ -0,0 +1,141 @@
+"""
+Sliding window throttles on the default cache.
+
+A rate of ``N/period`` (``DEFAULT_THROTTLE_RATES``) allows N requests in any
+period. Requests are counted per fixed window with the cache's atomic
+``incr``, and the previous window's count is weighted by how much of it
+still overlaps the sliding period. Every request takes its own slot, so
+concurrent requests cannot all pass on one stale read. Throttles run after
+authentication (which reads token claims) and before the view, and a
+rejected request only touches the cache, so floods never reach the
+database or the password hasher.
+"""
+import hashlib
+import time
+
+from django.core.cache import cache as default_cache
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+UPLOAD_METHODS = ('POST', 'PUT', 'PATCH')
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """``'10/min'`` -> ``(10, 60)``, in DRF's rate format."""
+    count, period = rate.split('/')
+    return int(count), PERIODS[period[0]]
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    cache = default_cache
+    timer = time.time
+    cache_format = 'throttle_%(scope)s_%(ident)s_%(window)s'
+    scope = None
+
+    def get_rates(self):
+        return api_settings.DEFAULT_THROTTLE_RATES
+
+    def get_scope(self, request):
+        return self.scope
+
+    def get_ident_key(self, request):
+        """Identity being limited, or ``None`` to skip throttling."""
+        return self.get_ident(request)
+
+    def allow_request(self, request, view):
+        scope = self.get_scope(request)
+        rate = self.get_rates().get(scope)
+        if rate is None:
+            return True
+        ident = self.get_ident_key(request)
+        if ident is None:
+            return True
+
+        capacity, period = parse_rate(rate)
+        now = self.timer()
+        window, elapsed = divmod(now, period)
+        key = self.cache_format % {'scope': scope, 'ident': ident, 'window': int(window)}
+        previous_key = self.cache_format % {'scope': scope, 'ident': ident, 'window': int(window) - 1}
+        count = self.increment(key, period)
+        previous = self.cache.get(previous_key, 0)
+        if previous * (1 - elapsed / period) + count <= capacity:
+            return True
+
+        # Give the slot back so rejected requests do not extend the lockout
+        self.cache.decr(key)
+        count -= 1
+        if count + 1 > capacity:
+            self.wait_seconds = period - elapsed
+        else:
+            self.wait_seconds = max(period * (1 - (capacity - count - 1) / previous) - elapsed, 0)
+        return False
+
+    def increment(self, key, period):
+        """Atomically count a request in the window ``key`` and return the new count."""
+        # Kept for two periods: the next window still weighs this one
+        self.cache.add(key, 0, period * 2)
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            # Expired between add and incr
+            self.cache.add(key, 0, period * 2)
+            return self.cache.incr(key)
+
+    def wait(self):
+        return getattr(self, 'wait_seconds', None)
+
+
+class RoleRateThrottle(SlidingWindowThrottle):
+    """
+    Per-account budget chosen by role: ``<scope>_<role>`` when configured,
+    otherwise ``<scope>``. Anonymous requests use ``anon_scope`` per IP.
+    """
+    scope = 'user'
+    anon_scope = 'anon'
+
+    def get_scope(self, request):
+        if not request.user.is_authenticated:
+            return self.anon_scope or self.scope
+        role_scope = f"{self.scope}_{request.user.role_code}"
+        return role_scope if role_scope in self.get_rates() else self.scope
+
+    def get_ident_key(self, request):
+        if request.user.is_authenticated:
+            return request.user.pk
+        return self.get_ident(request)
+
+
+class UploadRateThrottle(RoleRateThrottle):
+    """Separate budget for multipart uploads (``uploads`` / ``uploads_<role>``)."""
+    scope = 'uploads'
+    anon_scope = None
+
+    def get_ident_key(self, request):
+        if request.method not in UPLOAD_METHODS or not request.content_type.startswith('multipart/'):
+            return None
+        return super().get_ident_key(request)
+
+
+class LoginIPThrottle(SlidingWindowThrottle):
+    scope = 'login_ip'
+
+
+class LoginAccountThrottle(SlidingWindowThrottle):
+    """Limits attempts per submitted email, whichever IPs they come from."""
+    scope = 'login_account'
+
+    def get_ident_key(self, request):
+        email = request.data.get('email')
+        if not isinstance(email, str) or not email.strip():
+            return None
+        return hashlib.sha1(email.strip().lower().encode()).hexdigest()
+
+
+class RegisterIPThrottle(SlidingWindowThrottle):
+    scope = 'register_ip'
+
+
+class VerificationIPThrottle(SlidingWindowThrottle):
+    """QR verification lookups arrive in bursts from verifiers, often behind one IP."""
+    scope = 'verify_ip'
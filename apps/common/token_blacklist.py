@@ -0,0 +1,49 @@
+"""
+Blacklist of rotated refresh tokens.
+
+A refresh token can be used once. On rotation its ``jti`` is added to the
+cache, expiring together with the token, so a reused token is rejected
+with a single cache call. It is also written to ``BlacklistedToken`` so the
+blacklist survives a cache flush; the unique ``jti`` column catches reuse
+that the cache no longer remembers. Expired rows are deleted by a
+background job at most once per ``TOKEN_BLACKLIST_PRUNE_INTERVAL``, so the
+table only holds tokens that are still within their lifetime.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import BlacklistedToken
+from .tasks import enqueue
+
+BLACKLIST_KEY_PREFIX = 'token_blacklist:'
+PRUNE_MARKER_KEY = 'token_blacklist_pruned'
+
+
+def blacklist_key(jti):
+    return f"{BLACKLIST_KEY_PREFIX}{jti}"
+
+
+def consume_token(jti, expires_at):
+    """
+    Blacklist ``jti`` until ``expires_at``. Returns ``False`` when it was
+    already blacklisted, i.e. the token is being reused.
+    """
+    timeout = max(int((expires_at - timezone.now()).total_seconds()), 1)
+    if not cache.add(blacklist_key(jti), 1, timeout):
+        return False
+    try:
+        with transaction.atomic():
+            BlacklistedToken.objects.create(jti=jti, expires_at=expires_at)
+    except IntegrityError:
+        return False
+    if cache.add(PRUNE_MARKER_KEY, 1, settings.TOKEN_BLACKLIST_PRUNE_INTERVAL):
+        enqueue('apps.common.token_blacklist.prune_blacklist')
+    return True
+
+
+def prune_blacklist():
+    """Delete entries for tokens that have expired. Returns the number deleted."""
+    deleted, _ = BlacklistedToken.objects.filter(expires_at__lt=timezone.now()).delete()
+    return deleted
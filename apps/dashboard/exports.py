@@ -0,0 +1,131 @@
+"""
+Full exports of applications and payments.
+
+Each export is a flat ``values_list`` projection read with
+``iterator(chunk_size=...)`` (a server-side cursor on PostgreSQL), so rows
+are written out as the database produces them.
+"""
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from apps.applications.models import Application
+from apps.common.exports import CONTENT_TYPES, WRITERS
+from apps.payments.models import Payment
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+def _fee(payment_type, field):
+    return Subquery(
+        Payment.objects.filter(application=OuterRef('pk'), payment_type=payment_type)
+        .order_by('pk').values(field)[:1]
+    )
+
+
+APPLICATION_COLUMNS = [
+    ('Application ID', 'id'),
+    ('Tracking ID', 'tracking_id'),
+    ('Form No', 'application_form_no'),
+    ('Applied At', 'applied_at'),
+    ('Status', 'status__name'),
+    ('Program', 'program__name'),
+    ('Program Code', 'program__code'),
+    ('Session', 'academic_session__session'),
+    ('Preference', 'preference'),
+    ('Merit Score', 'merit_score'),
+    ('Merit Position', 'merit_position'),
+    ('Student ID', 'student_id'),
+    ('First Name', 'student__user__first_name'),
+    ('Last Name', 'student__user__last_name'),
+    ('Email', 'student__user__email'),
+    ('Phone', 'student__user__phone'),
+    ("Father's Name", 'student__personalinformation__father_name'),
+    ('CNIC', 'student__personalinformation__cnic'),
+    ('Date of Birth', 'student__personalinformation__date_of_birth'),
+    ('Gender', 'student__personalinformation__gender'),
+    ('District', 'student__contactinformation__district'),
+    ('Tehsil', 'student__contactinformation__tehsil'),
+    ('City', 'student__contactinformation__city'),
+    ('Permanent Address', 'student__contactinformation__permanent_address'),
+    ('Application Fee', 'application_fee_amount'),
+    ('Application Fee Status', 'application_fee_status'),
+    ('Admission Fee', 'admission_fee_amount'),
+    ('Admission Fee Status', 'admission_fee_status'),
+]
+
+PAYMENT_COLUMNS = [
+    ('Payment ID', 'id'),
+    ('Transaction ID', 'transaction_id'),
+    ('Type', 'payment_type'),
+    ('Amount', 'amount'),
+    ('Status', 'status'),
+    ('Method', 'payment_method__name'),
+    ('Bank Reference', 'bank_reference'),
+    ('Created At', 'created_at'),
+    ('Paid At', 'paid_at'),
+    ('Verified By', 'verified_by__email'),
+    ('Application ID', 'application_id'),
+    ('Tracking ID', 'application__tracking_id'),
+    ('Program', 'application__program__name'),
+    ('Session', 'application__academic_session__session'),
+    ('First Name', 'application__student__user__first_name'),
+    ('Last Name', 'application__student__user__last_name'),
+    ('Email', 'application__student__user__email'),
+    ('CNIC', 'application__student__personalinformation__cnic'),
+]
+
+
+def application_export_queryset(program=None, session=None, status=None, date_from=None, date_to=None):
+    queryset = Application.objects.all()
+    if program:
+        queryset = queryset.filter(program_id=program)
+    if session:
+        queryset = queryset.filter(academic_session_id=session)
+    if status:
+        queryset = queryset.filter(status__code=status)
+    if date_from:
+        queryset = queryset.filter(applied_at__date__gte=date_from)
+    if date_to:
+        queryset = queryset.filter(applied_at__date__lte=date_to)
+    return queryset.annotate(
+        application_fee_amount=_fee('application', 'amount'),
+        application_fee_status=_fee('application', 'status'),
+        admission_fee_amount=_fee('admission', 'amount'),
+        admission_fee_status=_fee('admission', 'status'),
+    ).order_by('pk')
+
+
+def payment_export_queryset(program=None, session=None, status=None, date_from=None, date_to=None):
+    queryset = Payment.objects.all()
+    if program:
+        queryset = queryset.filter(application__program_id=program)
+    if session:
+        queryset = queryset.filter(application__academic_session_id=session)
+    if status:
+        queryset = queryset.filter(status=status)
+    if date_from:
+        queryset = queryset.filter(created_at__date__gte=date_from)
+    if date_to:
+        queryset = queryset.filter(created_at__date__lte=date_to)
+    return queryset.order_by('pk')
+
+
+EXPORTS = {
+    'applications': (APPLICATION_COLUMNS, application_export_queryset),
+    'payments': (PAYMENT_COLUMNS, payment_export_queryset),
+}
+
+
+def stream_export(kind, file_type='csv', **filters):
+    """
+    Return ``(filename, content_type, chunks)`` for an export.
+
+    ``chunks`` is a generator; nothing is queried until it is consumed.
+    """
+    columns, build_queryset = EXPORTS[kind]
+    headers = [label for label, _ in columns]
+    rows = build_queryset(**filters).values_list(*[path for _, path in columns]).iterator(
+        chunk_size=EXPORT_CHUNK_SIZE
+    )
+    filename = f"{kind}-{timezone.localtime():%Y%m%d-%H%M%S}.{file_type}"
+    return filename, CONTENT_TYPES[file_type], WRITERS[file_type](headers, rows)
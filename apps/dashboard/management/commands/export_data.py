@@ -0,0 +1,42 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from apps.dashboard.exports import EXPORTS, stream_export
+
+
+class Command(BaseCommand):
+    help = 'Stream a full export of applications or payments to a CSV or XLSX file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(EXPORTS))
+        parser.add_argument('--format', dest='file_type', choices=['csv', 'xlsx'], default='csv')
+        parser.add_argument('--output', '-o', help='File to write (default: generated name; "-" for stdout)')
+        parser.add_argument('--program', type=int)
+        parser.add_argument('--session', type=int)
+        parser.add_argument('--status')
+        parser.add_argument('--date-from')
+        parser.add_argument('--date-to')
+
+    def handle(self, *args, **options):
+        filename, _, chunks = stream_export(
+            options['kind'],
+            options['file_type'],
+            program=options['program'],
+            session=options['session'],
+            status=options['status'],
+            date_from=options['date_from'],
+            date_to=options['date_to'],
+        )
+        output = options['output'] or filename
+        if output == '-':
+            for chunk in chunks:
+                sys.stdout.buffer.write(chunk)
+            return
+
+        written = 0
+        with open(output, 'wb') as handle:
+            for chunk in chunks:
+                handle.write(chunk)
+                written += len(chunk)
+        self.stderr.write(self.style.SUCCESS(f'Wrote {written} bytes to {output}'))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.dashboard.services import rebuild_admission_stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute AdmissionStats counters from the applications table'
+
+    def handle(self, *args, **options):
+        created = rebuild_admission_stats()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt admission stats for {created} programs'))
@@ -0,0 +1,22 @@
+from django.db import migrations
+
+from apps.dashboard.services import rebuild_admission_stats
+
+
+def backfill_admission_stats(apps, schema_editor):
+    rebuild_admission_stats(
+        apps.get_model('applications', 'Application'),
+        apps.get_model('dashboard', 'AdmissionStats'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0003_initial'),
+        ('applications', '0009_application_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_admission_stats, migrations.RunPython.noop),
+    ]
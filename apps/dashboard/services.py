@@ -0,0 +1,122 @@
+import time
+from collections import Counter
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from .models import AdmissionStats
+
+# Status codes with their own counter; every other status counts as pending
+STATUS_COUNTERS = {
+    'approved': 'approved_applications',
+    'rejected': 'rejected_applications',
+}
+
+
+STATS_VERSION_KEY = 'admission-stats:version'
+
+
+def get_stats_version():
+    version = cache.get(STATS_VERSION_KEY)
+    if version is None:
+        # Seed from the clock so an evicted key never revives old cache entries
+        cache.add(STATS_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(STATS_VERSION_KEY)
+    return version
+
+
+def bump_stats_version():
+    """Invalidate every cached statistics result once the transaction commits."""
+    def bump():
+        try:
+            cache.incr(STATS_VERSION_KEY)
+        except ValueError:
+            cache.add(STATS_VERSION_KEY, time.time_ns(), None)
+    transaction.on_commit(bump)
+
+
+def status_counter(status_code):
+    return STATUS_COUNTERS.get(status_code, 'pending_applications')
+
+
+def apply_stats_deltas(program_id, session_id, deltas):
+    """Atomically add ``deltas`` ({counter: n}) to one (session, program) row."""
+    deltas = {field: n for field, n in deltas.items() if n}
+    if not deltas:
+        return
+    updates = {field: F(field) + n for field, n in deltas.items()}
+    updates['last_updated'] = timezone.now()
+    rows = AdmissionStats.objects.filter(program_id=program_id, session_id=session_id)
+    if not rows.update(**updates):
+        AdmissionStats.objects.get_or_create(program_id=program_id, session_id=session_id)
+        rows.update(**updates)
+    bump_stats_version()
+
+
+def record_submission(program_id, session_id, status_code, count=1):
+    apply_stats_deltas(program_id, session_id, {
+        'total_applications': count,
+        status_counter(status_code): count,
+    })
+
+
+def record_removal(program_id, session_id, status_code):
+    record_submission(program_id, session_id, status_code, count=-1)
+
+
+def record_status_changes(changes):
+    """
+    Move counters for status transitions.
+
+    ``changes`` is an iterable of ``(program_id, session_id, old_code, new_code)``.
+    Issues one UPDATE per (session, program) touched.
+    """
+    grouped = {}
+    for program_id, session_id, old_code, new_code in changes:
+        old_field, new_field = status_counter(old_code), status_counter(new_code)
+        if old_field == new_field:
+            continue
+        deltas = grouped.setdefault((program_id, session_id), Counter())
+        deltas[old_field] -= 1
+        deltas[new_field] += 1
+    for (program_id, session_id), deltas in grouped.items():
+        apply_stats_deltas(program_id, session_id, deltas)
+
+
+def rebuild_admission_stats(application_model=None, stats_model=None):
+    """
+    Recompute every ``AdmissionStats`` row from the applications table.
+
+    The models can be passed in so data migrations can use their historical
+    versions. Returns the number of rows written.
+    """
+    if application_model is None:
+        from apps.applications.models import Application
+        application_model = Application
+    stats_model = stats_model or AdmissionStats
+
+    annotations = {
+        'total_applications': Count('id'),
+        'pending_applications': Count('id', filter=~Q(status__code__in=list(STATUS_COUNTERS))),
+    }
+    for code, field in STATUS_COUNTERS.items():
+        annotations[field] = Count('id', filter=Q(status__code=code))
+
+    rows = application_model.objects.values('program_id', 'academic_session_id').annotate(**annotations).order_by()
+
+    with transaction.atomic():
+        stats_model.objects.all().delete()
+        created = stats_model.objects.bulk_create([
+            stats_model(
+                program_id=row['program_id'],
+                session_id=row['academic_session_id'],
+                total_applications=row['total_applications'],
+                approved_applications=row['approved_applications'],
+                rejected_applications=row['rejected_applications'],
+                pending_applications=row['pending_applications'],
+            )
+            for row in rows
+        ])
+    return len(created)
@@ -0,0 +1,86 @@
+"""
+Grouped application statistics, cached under a version bumped on every
+submission and status change.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Sum
+
+from apps.applications.models import Application, ApplicationStatus
+from .models import AdmissionStats
+from .services import STATUS_COUNTERS, get_stats_version
+
+# dimension -> (id lookup, label lookup)
+DIMENSIONS = {
+    'program': ('program_id', 'program__name'),
+    'session': ('academic_session_id', 'academic_session__session'),
+    'status': ('status__code', 'status__name'),
+    'gender': ('student__personalinformation__gender', None),
+    'district': ('student__contactinformation__district', None),
+}
+
+
+def compute_statistics(group_by, date_from=None, date_to=None):
+    queryset = Application.objects.all()
+    if date_from:
+        queryset = queryset.filter(applied_at__date__gte=date_from)
+    if date_to:
+        queryset = queryset.filter(applied_at__date__lte=date_to)
+
+    lookups = []
+    for dimension in group_by:
+        lookups.extend(lookup for lookup in DIMENSIONS[dimension] if lookup)
+    if not lookups:
+        return [{'count': queryset.count()}]
+
+    rows = queryset.values(*lookups).annotate(count=Count('id')).order_by(*lookups)
+    results = []
+    for row in rows:
+        item = {}
+        for dimension in group_by:
+            value_lookup, label_lookup = DIMENSIONS[dimension]
+            item[dimension] = row[value_lookup]
+            if label_lookup:
+                item[f'{dimension}_name'] = row[label_lookup]
+        item['count'] = row['count']
+        results.append(item)
+    return results
+
+
+def compute_status_summary():
+    """Totals per counter, summed over the ``AdmissionStats`` rows."""
+    fields = ['total_applications', *STATUS_COUNTERS.values(), 'pending_applications']
+    totals = AdmissionStats.objects.aggregate(**{field: Sum(field) for field in fields})
+    names = dict(ApplicationStatus.objects.filter(code__in=list(STATUS_COUNTERS)).values_list('code', 'name'))
+    labels = {'total_applications': 'Total', 'pending_applications': 'Pending'}
+    labels.update((field, names.get(code, code.title())) for code, field in STATUS_COUNTERS.items())
+    return [{'status__name': labels[field], 'count': totals[field] or 0} for field in fields]
+
+
+def get_status_summary():
+    """Return ``compute_status_summary()``, served from cache until the data changes."""
+    key = f'admission-stats:{get_stats_version()}:summary'
+    results = cache.get(key)
+    if results is None:
+        results = compute_status_summary()
+        cache.set(key, results, settings.ADMISSION_STATS_CACHE_TIMEOUT)
+    return results
+
+
+def get_statistics(group_by, date_from=None, date_to=None):
+    """Return grouped counts, served from cache until the data changes."""
+    params = json.dumps({
+        'group_by': list(group_by),
+        'date_from': date_from.isoformat() if date_from else None,
+        'date_to': date_to.isoformat() if date_to else None,
+    })
+    digest = hashlib.md5(params.encode()).hexdigest()
+    key = f'admission-stats:{get_stats_version()}:{digest}'
+    results = cache.get(key)
+    if results is None:
+        results = compute_statistics(group_by, date_from, date_to)
+        cache.set(key, results, settings.ADMISSION_STATS_CACHE_TIMEOUT)
+    return results
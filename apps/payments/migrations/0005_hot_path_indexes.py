@@ -0,0 +1,25 @@
+# Generated by Django 5.2.1 on 2026-10-17 17:47
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0008_hot_path_indexes'),
+        ('payments', '0004_keyset_pagination_indexes'),
+        ('programs', '0004_hot_path_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='feestructure',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['session', 'program'], name='fee_structure_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['application', 'payment_type'], name='payment_app_type_idx'),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Q
 from django.conf import settings
 from django.utils import timezone
 from apps.applications.models import Application
@@ -14,6 +15,9 @@ class FeeStructure(models.Model):
     
     class Meta:
         unique_together = ['program', 'session']
+        indexes = [
+            models.Index(fields=['session', 'program'], condition=Q(is_active=True), name='fee_structure_active_idx'),
+        ]
     
     def __str__(self):
         return f"{self.program.name} - {self.session.session}"
@@ -50,6 +54,13 @@ class Payment(models.Model):
     verified_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
     receipt = models.FileField(upload_to='payments/receipts/', blank=True)
     created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='payment_created_id_idx'),
+            models.Index(fields=['application', 'payment_type'], name='payment_app_type_idx'),
+        ]
     
     def __str__(self):
         return f"{self.application.tracking_id} - {self.payment_type} - {self.amount}"
\ No newline at end of file
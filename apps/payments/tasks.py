@@ -0,0 +1,25 @@
+import uuid
+
+from .models import FeeStructure, Payment
+from apps.applications.models import Application
+
+
+def create_application_fee(application_id):
+    """Create the pending application fee record for a new submission."""
+    application = Application.objects.filter(pk=application_id).first()
+    if not application:
+        return
+    fee_structure = FeeStructure.objects.filter(
+        program_id=application.program_id,
+        session_id=application.academic_session_id,
+        is_active=True
+    ).first()
+    if fee_structure:
+        Payment.objects.get_or_create(
+            application=application,
+            payment_type='application',
+            defaults={
+                'amount': fee_structure.application_fee,
+                'transaction_id': f"APP-{uuid.uuid4().hex[:8].upper()}"
+            }
+        )
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.1 on 2026-10-17 17:30
+
+from django.db import migrations, models
+
+
+def backfill_approved_counts(apps, schema_editor):
+    Application = apps.get_model('applications', 'Application')
+    OfferedProgram = apps.get_model('programs', 'OfferedProgram')
+    approved = Application.objects.filter(status__code='approved').values(
+        'program_id', 'academic_session_id'
+    ).annotate(count=models.Count('id')).order_by()
+    for row in approved:
+        OfferedProgram.objects.filter(
+            program_id=row['program_id'], session_id=row['academic_session_id']
+        ).update(approved_count=row['count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('programs', '0002_initial'),
+        ('applications', '0003_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='offeredprogram',
+            name='approved_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_approved_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.1 on 2026-10-17 17:47
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('programs', '0003_offered_program_seat_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='offeredprogram',
+            index=models.Index(fields=['program', 'session'], name='offered_program_session_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.1 on 2026-10-17 18:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('programs', '0004_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['is_active'], name='course_live_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='program',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['is_active'], name='program_live_idx'),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Q
 from django.utils import timezone
 from django.conf import settings
 
@@ -22,6 +23,11 @@ class Course(models.Model):
         related_name='updated_courses'
     )
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['is_active'], condition=Q(is_deleted=False), name='course_live_idx'),
+        ]
+
     def __str__(self):
         return f"{self.name} ({self.code})"
 
@@ -47,6 +53,11 @@ class Program(models.Model):
         related_name='updated_programs'
     )
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['is_active'], condition=Q(is_deleted=False), name='program_live_idx'),
+        ]
+
     def __str__(self):
         return f"{self.name} ({self.code})"
 
@@ -81,6 +92,8 @@ class OfferedProgram(models.Model):
     program = models.ForeignKey(Program, on_delete=models.CASCADE, related_name='offerings')
     session = models.ForeignKey(AcademicSession, on_delete=models.CASCADE, related_name='offered_programs')
     total_seats = models.PositiveIntegerField(default=0)
+    # Denormalized seat usage, maintained by status transitions
+    approved_count = models.PositiveIntegerField(default=0)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(default=timezone.now)
     created_by = models.ForeignKey(
@@ -96,5 +109,18 @@ class OfferedProgram(models.Model):
         related_name='updated_offered_program'
     )
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['program', 'session'], name='offered_program_session_idx'),
+        ]
+
+    @property
+    def available_seats(self):
+        return max(self.total_seats - self.approved_count, 0)
+
+    @property
+    def sold_out(self):
+        return self.available_seats == 0
+
     def __str__(self):
         return f"{self.program.name} ({self.session.session})"
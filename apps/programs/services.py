@@ -0,0 +1,68 @@
+from collections import Counter
+from functools import reduce
+from operator import or_
+
+from django.db import transaction
+from django.db.models import F, Q
+
+from .models import OfferedProgram
+
+
+class SeatsUnavailable(Exception):
+    """Raised when an offering has no seat left for an approval."""
+
+
+def _offering_filter(keys):
+    return reduce(or_, (Q(program_id=program_id, session_id=session_id) for program_id, session_id in keys))
+
+
+def reserve_seats(requested):
+    """
+    Take seats on the offerings in ``requested`` ({(program_id, session_id): n}).
+
+    Only the offering rows involved are locked (``SELECT ... FOR UPDATE`` in
+    primary key order, so concurrent batches cannot deadlock), which keeps
+    approvals for different programs independent. Returns the number of seats
+    granted per key; a key without an ``OfferedProgram`` has no seat limit.
+    Must run inside the caller's transaction.
+    """
+    requested = {key: n for key, n in requested.items() if n > 0}
+    if not requested:
+        return Counter()
+
+    with transaction.atomic():
+        offerings = {
+            (offering.program_id, offering.session_id): offering
+            for offering in OfferedProgram.objects.select_for_update().filter(
+                _offering_filter(requested)
+            ).order_by('pk')
+        }
+        granted = Counter()
+        for key, count in requested.items():
+            offering = offerings.get(key)
+            if offering is None:
+                granted[key] = count
+                continue
+            granted[key] = min(count, offering.available_seats)
+            if granted[key]:
+                OfferedProgram.objects.filter(pk=offering.pk).update(
+                    approved_count=F('approved_count') + granted[key]
+                )
+    return granted
+
+
+def release_seats(changes):
+    """
+    Give back seats for applications leaving the approved status.
+
+    ``changes`` is an iterable of ``(program_id, session_id, old_code, new_code)``.
+    Issues one UPDATE per offering that releases seats.
+    """
+    released = Counter()
+    for program_id, session_id, old_code, new_code in changes:
+        if old_code == 'approved' and new_code != 'approved':
+            released[(program_id, session_id)] += 1
+    for (program_id, session_id), count in released.items():
+        OfferedProgram.objects.filter(
+            program_id=program_id, session_id=session_id, approved_count__gte=count
+        ).update(approved_count=F('approved_count') - count)
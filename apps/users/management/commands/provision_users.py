@@ -0,0 +1,55 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.users.models import Role
+from apps.users.provisioning import provision_users
+
+
+class Command(BaseCommand):
+    help = 'Create user accounts (and empty applicant profiles) from a CSV file in bulk'
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_file', help="CSV with an 'email' column and optional first_name, last_name, "
+                                             "phone, cnic, role and password columns ('-' reads stdin)")
+        parser.add_argument('--role', default='applicant', choices=[code for code, _ in Role.ROLE_CHOICES],
+                            help='Role for rows without one (default: applicant)')
+        parser.add_argument('--batch-size', type=int, default=None,
+                            help='Rows per INSERT (default: PROVISIONING_BATCH_SIZE)')
+        parser.add_argument('--workers', type=int, default=None,
+                            help='Password hashing processes (default: PROVISIONING_WORKERS or all cores)')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+
+        def progress(summary):
+            self.stdout.write(f"\r{summary['rows']} rows, {summary['created']} created", ending='')
+            self.stdout.flush()
+
+        try:
+            if options['csv_file'] == '-':
+                summary = self.provision(sys.stdin, options, progress)
+            else:
+                with open(options['csv_file'], encoding='utf-8-sig', newline='') as stream:
+                    summary = self.provision(stream, options, progress)
+        except OSError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write('')
+        for line, message in summary['errors']:
+            self.stderr.write(f'Line {line}: {message}')
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {summary['created']} users ({summary['profiles']} applicant profiles), "
+            f"skipped {summary['skipped']} existing, {summary['failed']} failed "
+            f"in {time.monotonic() - started:.1f}s"
+        ))
+
+    def provision(self, stream, options, progress):
+        return provision_users(
+            stream,
+            default_role=options['role'],
+            batch_size=options['batch_size'],
+            workers=options['workers'],
+            progress=progress,
+        )
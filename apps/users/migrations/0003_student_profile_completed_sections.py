@@ -0,0 +1,34 @@
+# Generated by Django 5.2.1 on 2026-10-17 17:48
+
+from django.db import migrations, models
+
+
+def backfill_completed_sections(apps, schema_editor):
+    StudentProfile = apps.get_model('users', 'StudentProfile')
+    sections = [
+        (1, 'PersonalInformation', 'student_id'),
+        (2, 'ContactInformation', 'student_id'),
+        (4, 'EducationalBackground', 'student_id'),
+        (8, 'MedicalInformation', 'student_id'),
+    ]
+    for bit, model_name, field in sections:
+        model = apps.get_model('users', model_name)
+        StudentProfile.objects.filter(
+            pk__in=model.objects.values(field)
+        ).update(completed_sections=models.F('completed_sections').bitor(bit))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentprofile',
+            name='completed_sections',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_completed_sections, migrations.RunPython.noop),
+    ]
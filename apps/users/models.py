@@ -3,7 +3,7 @@ from django.contrib.auth.models import AbstractUser, Group
 from django.utils import timezone
 from django.contrib.auth.base_user import BaseUserManager
 from django.conf import settings
-from django.core.exceptions import ValidationError
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
 
 class CustomUserManager(BaseUserManager):
     def create_user(self, email, password=None, **extra_fields):
@@ -66,19 +66,86 @@ class CustomUser(AbstractUser):
     cnic = models.CharField(max_length=15, blank=True)
     role = models.ForeignKey(Role, null=True, blank=True, on_delete=models.SET_NULL)
     is_verified = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+    # Embedded in access tokens; bumping it revokes the user's tokens
+    token_version = models.PositiveIntegerField(default=0, editable=False)
 
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['first_name', 'last_name']
+    # Changing any of these revokes the user's existing tokens
+    TOKEN_REVOKING_FIELDS = ('role_id', 'is_active', 'password')
 
     objects = CustomUserManager()
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(fields=['date_joined', 'id'], name='user_date_joined_id_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        checked = {'role', 'role_id', 'is_active', 'password'}
+        if not self._state.adding and self.pk and (update_fields is None or checked & set(update_fields)):
+            # Compare with the stored row so every path (admin, shell, views) is covered
+            stored = CustomUser.objects.filter(pk=self.pk).values(
+                *self.TOKEN_REVOKING_FIELDS, 'token_version'
+            ).first()
+            if stored and any(stored[field] != getattr(self, field) for field in self.TOKEN_REVOKING_FIELDS):
+                from apps.common.authentication import forget_token_versions
+
+                self.token_version = stored['token_version'] + 1
+                if update_fields is not None:
+                    kwargs['update_fields'] = set(update_fields) | {'token_version'}
+                forget_token_versions([self.pk])
+        super().save(*args, **kwargs)
+
+    @property
+    def role_code(self):
+        return self.role.role if self.role_id else None
+
+    @property
+    def student_profile_id(self):
+        try:
+            return self.student_profile.pk
+        except ObjectDoesNotExist:
+            return None
+
     def __str__(self):
         return f"{self.email} ({self.role})"
 
 class StudentProfile(models.Model):
+    # Bits of ``completed_sections``, set by the section views when a section is saved
+    PERSONAL = 1
+    CONTACT = 2
+    EDUCATION = 4
+    MEDICAL = 8
+    ALL_SECTIONS = PERSONAL | CONTACT | EDUCATION | MEDICAL
+
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="student_profile")
     picture = models.ImageField(upload_to="students/pictures/")
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_sections = models.PositiveSmallIntegerField(default=0, editable=False)
+
+    def has_sections(self, sections):
+        return self.completed_sections & sections == sections
+
+    @property
+    def profile_completion(self):
+        """Percentage of the four profile sections that are filled in."""
+        return 25 * bin(self.completed_sections & self.ALL_SECTIONS).count('1')
+
+    def mark_section(self, section, complete=True):
+        """Set or clear one section bit with a single atomic UPDATE; unsaved profiles are left alone."""
+        if self.pk is None:
+            return
+        if complete:
+            value = models.F('completed_sections').bitor(section)
+            self.completed_sections |= section
+        else:
+            value = models.F('completed_sections').bitand(self.ALL_SECTIONS & ~section)
+            self.completed_sections &= ~section
+        StudentProfile.objects.filter(pk=self.pk).update(completed_sections=value)
 
     def __str__(self):
         return self.user.get_full_name()
@@ -92,6 +159,7 @@ class PersonalInformation(models.Model):
     cnic_back_img = models.ImageField(upload_to="students/cnic/back/")
     date_of_birth = models.DateField()
     gender = models.CharField(max_length=10, choices=[("male", "Male"), ("female", "Female"), ("other", "Other")])
+    updated_at = models.DateTimeField(auto_now=True)
 
 class ContactInformation(models.Model):
     student = models.OneToOneField(StudentProfile, on_delete=models.CASCADE)
@@ -101,6 +169,7 @@ class ContactInformation(models.Model):
     permanent_address = models.TextField()
     current_address = models.TextField()
     postal_address = models.TextField()
+    updated_at = models.DateTimeField(auto_now=True)
 
 class StudentRelative(models.Model):
     student = models.ForeignKey(StudentProfile, on_delete=models.CASCADE, related_name="relatives")
@@ -109,6 +178,7 @@ class StudentRelative(models.Model):
     contact_one = models.CharField(max_length=20)
     contact_two = models.CharField(max_length=20, blank=True)
     address = models.TextField()
+    updated_at = models.DateTimeField(auto_now=True)
 
 class Degree(models.Model):
     name = models.CharField(max_length=80, unique=True, blank=True)
@@ -132,6 +202,7 @@ class EducationalBackground(models.Model):
     percentage = models.FloatField(blank=True)
     grade = models.CharField(max_length=10, blank=True)
     certificate = models.FileField(upload_to="students/certificates/")
+    updated_at = models.DateTimeField(auto_now=True)
 
     def save(self, *args, **kwargs):
         self.full_clean()
@@ -163,6 +234,7 @@ class MedicalInformation(models.Model):
     blood_group = models.ForeignKey(BloodGroup, on_delete=models.CASCADE,null=True, blank=True)
     diseases = models.ManyToManyField(Disease)
     is_disabled = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"Medical Info for {self.student.user.email}"
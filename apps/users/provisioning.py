@@ -0,0 +1,250 @@
+"""
+Bulk provisioning of user accounts from CSV.
+
+Rows are read as a stream and handled in batches. Each batch is checked
+against existing emails with one query, its passwords are hashed in a
+process pool (password hashing is deliberately slow, so it dominates a
+large import), and users and empty applicant profiles are written with one
+INSERT each. The next batch is hashed while the current one is written.
+Accounts whose email already exists are skipped, so an interrupted import
+can simply be run again.
+
+Uploaded files contain plaintext passwords. They are kept in a private
+directory outside MEDIA_ROOT (``PROVISIONING_UPLOAD_DIR``) and deleted once
+the import has run; files whose job never ran are pruned by a later upload.
+"""
+import csv
+import io
+import logging
+import multiprocessing
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group
+from django.core.exceptions import ValidationError
+from django.core.files.storage import FileSystemStorage
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from apps.applications.search import reindex_students
+from .models import CustomUser, Role, StudentProfile
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = ('email', 'first_name', 'last_name', 'phone', 'cnic', 'role', 'password')
+REQUIRED_COLUMNS = ('email',)
+# Columns copied to the user as they are, checked against the column lengths
+TEXT_COLUMNS = ('first_name', 'last_name', 'phone', 'cnic')
+MIN_PASSWORD_LENGTH = 8
+# Errors kept in the summary; the rest are only counted
+MAX_REPORTED_ERRORS = 100
+# Uploads older than this are assumed abandoned and deleted
+UPLOAD_MAX_AGE = timedelta(days=1)
+
+
+def upload_storage():
+    """Private storage for uploaded CSVs; it has no URL."""
+    return FileSystemStorage(location=settings.PROVISIONING_UPLOAD_DIR, base_url=None)
+
+
+def store_upload(upload):
+    """Save an uploaded CSV for ``provision_users_file``, pruning abandoned ones, and return its name."""
+    storage = upload_storage()
+    cutoff = timezone.now() - UPLOAD_MAX_AGE
+    _, names = storage.listdir('') if os.path.isdir(storage.location) else ([], [])
+    for name in names:
+        if storage.get_modified_time(name) < cutoff:
+            storage.delete(name)
+    return storage.save(f"{uuid.uuid4().hex}.csv", upload)
+
+
+def missing_columns(fieldnames):
+    """Required columns absent from a CSV header."""
+    fieldnames = [name.strip().lower() for name in fieldnames or []]
+    return [column for column in REQUIRED_COLUMNS if column not in fieldnames]
+
+
+def ensure_roles(codes):
+    """Return ``{code: Role}`` for ``codes``, creating missing roles and their groups."""
+    roles = {role.role: role for role in Role.objects.filter(role__in=codes)}
+    names = dict(Role.ROLE_CHOICES)
+    missing = [code for code in codes if code not in roles]
+    if missing:
+        Role.objects.bulk_create([
+            Role(role=code, group=Group.objects.get_or_create(name=names[code])[0]) for code in missing
+        ], ignore_conflicts=True)
+        roles.update((role.role, role) for role in Role.objects.filter(role__in=missing))
+    return roles
+
+
+def read_batches(stream, batch_size):
+    """Yield lists of ``(line number, row)`` from a CSV text stream."""
+    reader = csv.DictReader(stream)
+    if reader.fieldnames:
+        reader.fieldnames = [name.strip().lower() for name in reader.fieldnames]
+    batch = []
+    for row in reader:
+        batch.append((reader.line_num, {column: (row.get(column) or '').strip() for column in COLUMNS}))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def provision_users(stream, default_role='applicant', batch_size=None, workers=None, progress=None):
+    """
+    Create accounts from the CSV text ``stream``.
+
+    Columns: ``email`` (required), ``first_name``, ``last_name``, ``phone``,
+    ``cnic``, ``role`` (defaults to ``default_role``) and ``password``. Rows
+    without a password get an unusable one, so the user has to reset it.
+    Applicants also get an empty ``StudentProfile``. ``workers`` defaults to
+    ``PROVISIONING_WORKERS`` (all cores when unset); with one worker
+    passwords are hashed inline. ``progress(summary)`` is called after each
+    batch. Returns ``{'rows', 'created', 'profiles', 'skipped', 'failed', 'errors'}``
+    where ``errors`` lists the first ``(line, message)`` pairs.
+    """
+    batch_size = batch_size or settings.PROVISIONING_BATCH_SIZE
+    workers = workers or settings.PROVISIONING_WORKERS or os.cpu_count() or 1
+    roles = ensure_roles([code for code, _ in Role.ROLE_CHOICES])
+    if default_role not in roles:
+        raise ValueError(f"Unknown role: {default_role}")
+
+    summary = {'rows': 0, 'created': 0, 'profiles': 0, 'skipped': 0, 'failed': 0, 'errors': []}
+    seen = set()
+    max_lengths = {column: CustomUser._meta.get_field(column).max_length for column in ('email',) + TEXT_COLUMNS}
+
+    def fail(line, message):
+        summary['failed'] += 1
+        if len(summary['errors']) < MAX_REPORTED_ERRORS:
+            summary['errors'].append((line, message))
+
+    def prepare(batch):
+        """Validate a batch and drop duplicates; return ``[(user, password)]``."""
+        accounts = []
+        for line, row in batch:
+            summary['rows'] += 1
+            email = CustomUser.objects.normalize_email(row['email'])
+            try:
+                validate_email(email)
+                if len(email) > max_lengths['email']:
+                    raise ValidationError('Email too long')
+            except ValidationError:
+                fail(line, f"Invalid email: {row['email'] or '(blank)'}")
+                continue
+            role = roles.get(row['role'] or default_role)
+            if role is None:
+                fail(line, f"Unknown role: {row['role']}")
+                continue
+            if row['password'] and len(row['password']) < MIN_PASSWORD_LENGTH:
+                fail(line, f"Password shorter than {MIN_PASSWORD_LENGTH} characters")
+                continue
+            too_long = [column for column in TEXT_COLUMNS if len(row[column]) > max_lengths[column]]
+            if too_long:
+                fail(line, ', '.join(f"{column} longer than {max_lengths[column]} characters" for column in too_long))
+                continue
+            if email in seen:
+                summary['skipped'] += 1
+                continue
+            seen.add(email)
+            user = CustomUser(email=email, role=role, **{column: row[column] for column in TEXT_COLUMNS})
+            accounts.append((user, row['password']))
+        return drop_existing(accounts)
+
+    def drop_existing(accounts):
+        existing = set(CustomUser.objects.filter(
+            email__in=[user.email for user, _ in accounts]
+        ).values_list('email', flat=True))
+        summary['skipped'] += len(existing)
+        return [(user, password) for user, password in accounts if user.email not in existing]
+
+    def hash_passwords(accounts, executor):
+        passwords = [password for _, password in accounts if password]
+        if executor is None or len(passwords) <= 1:
+            return iter([make_password(password) for password in passwords])
+        return executor.map(make_password, passwords, chunksize=max(1, len(passwords) // (workers * 4)))
+
+    def write(accounts, hashes):
+        for user, password in accounts:
+            user.password = next(hashes) if password else make_password(None)
+        users = [user for user, _ in accounts]
+        try:
+            create(users)
+        except IntegrityError:
+            # Someone registered one of these emails since the batch was checked
+            for user in users:
+                user.pk = None
+            create([user for user, _ in drop_existing(accounts)])
+        if progress:
+            progress(summary)
+
+    def create(users):
+        with transaction.atomic():
+            CustomUser.objects.bulk_create(users)
+            if any(user.pk is None for user in users):
+                ids = dict(CustomUser.objects.filter(
+                    email__in=[user.email for user in users]
+                ).values_list('email', 'id'))
+                for user in users:
+                    user.pk = ids[user.email]
+            profiles = StudentProfile.objects.bulk_create([
+                StudentProfile(user=user, completed_sections=0)
+                for user in users if user.role.role == 'applicant'
+            ])
+            if any(profile.pk is None for profile in profiles):
+                profiles = list(StudentProfile.objects.filter(user__in=users))
+            reindex_students([profile.pk for profile in profiles])
+        summary['created'] += len(users)
+        summary['profiles'] += len(profiles)
+
+    def run(executor):
+        # Hash the next batch in the pool while the previous one is written
+        pending = None
+        for batch in read_batches(stream, batch_size):
+            accounts = prepare(batch)
+            current = (accounts, hash_passwords(accounts, executor))
+            if pending:
+                write(*pending)
+            pending = current
+        if pending:
+            write(*pending)
+
+    if workers == 1:
+        run(None)
+    else:
+        # Spawned children set Django up themselves instead of inheriting DB sockets
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=django.setup,
+        ) as executor:
+            run(executor)
+    return summary
+
+
+def provision_users_file(name, default_role='applicant'):
+    """Background job: provision accounts from an uploaded CSV, then delete it."""
+    storage = upload_storage()
+    if not storage.exists(name):
+        return None
+    try:
+        with storage.open(name, 'rb') as upload:
+            stream = io.TextIOWrapper(upload, encoding='utf-8-sig', newline='')
+            summary = provision_users(stream, default_role=default_role)
+    finally:
+        # Never keep plaintext passwords around; a failed import is uploaded again
+        storage.delete(name)
+    logger.info(
+        'Provisioned %s accounts from %s (%s rows, %s skipped, %s failed)',
+        summary['created'], name, summary['rows'], summary['skipped'], summary['failed'],
+    )
+    for line, message in summary['errors']:
+        logger.warning('%s line %s: %s', name, line, message)
+    return summary
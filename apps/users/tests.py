@@ -1,3 +1,136 @@
-from django.test import TestCase
+import io
+import shutil
+import tempfile
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, TransactionTestCase, override_settings
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.users.models import BloodGroup, CustomUser, Degree, Disease, Institute, Role, StudentProfile
+
+
+def image_upload(name='image.png'):
+    buffer = io.BytesIO()
+    Image.new('RGB', (4, 4)).save(buffer, 'PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+
+class ProfileCompletionTests(TestCase):
+    """Each section view keeps ``completed_sections`` in step with its section."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.media_root = tempfile.mkdtemp()
+        cls.media_override = override_settings(MEDIA_ROOT=cls.media_root)
+        cls.media_override.enable()
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls.media_override.disable()
+        shutil.rmtree(cls.media_root, ignore_errors=True)
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            email='applicant@example.com', password='password123',
+            role=Role.objects.create(role='applicant'),
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def completion(self):
+        return StudentProfile.objects.get(user=self.user).profile_completion
+
+    def add_education(self):
+        response = self.client.post('/api/v1/educational-background/', {
+            'institution': Institute.objects.get_or_create(name='Government High School')[0].pk,
+            'degree': Degree.objects.get_or_create(name='Matric')[0].pk,
+            'passing_year': 2020, 'total_marks': 1100, 'obtained_marks': 900, 'grade': 'A',
+            'certificate': image_upload('certificate.png'),
+        }, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        return response.data['id']
+
+    def test_section_views_update_completion(self):
+        response = self.client.post('/api/v1/profile/personal-info/', {
+            'father_name': 'Aslam Khan', 'cnic': '35202-1234567-1', 'registered_contact': '03001234567',
+            'cnic_front_img': image_upload('front.png'), 'cnic_back_img': image_upload('back.png'),
+            'date_of_birth': '2005-01-01', 'gender': 'male',
+        }, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        self.assertEqual(self.completion(), 25)
+
+        response = self.client.post('/api/v1/profile/contact-info/', {
+            'district': 'Lahore', 'tehsil': 'Lahore City', 'city': 'Lahore',
+            'permanent_address': 'a', 'current_address': 'a', 'postal_address': 'a',
+        })
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        self.assertEqual(self.completion(), 50)
+
+        response = self.client.post('/api/v1/profile/medical-info/', {
+            'blood_group': BloodGroup.objects.create(name='A+').pk,
+            'diseases': [Disease.objects.create(name='None').pk],
+        })
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        self.assertEqual(self.completion(), 75)
+
+        first, second = self.add_education(), self.add_education()
+        self.assertEqual(self.completion(), 100)
+
+        # The section stays complete while any educational record is left
+        self.assertEqual(self.client.delete(f'/api/v1/educational-background/{first}/').status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.completion(), 100)
+        self.assertEqual(self.client.delete(f'/api/v1/educational-background/{second}/').status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.completion(), 75)
+
+    def test_mark_section_ignores_unsaved_profile(self):
+        profile = StudentProfile(user=self.user)
+        profile.mark_section(StudentProfile.PERSONAL)
+        self.assertEqual(profile.completed_sections, 0)
+        self.assertEqual(profile.profile_completion, 0)
+
+
+class TokenRevocationTests(TransactionTestCase):
+    """
+    Tokens issued before a role, active flag or password change are refused.
+
+    The cached token version is dropped on commit, so this needs real commits.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser.objects.create_user(
+            email='reviewer@example.com', password='password123',
+            role=Role.objects.create(role='reviewer'),
+        )
+        self.client = APIClient()
+        response = self.client.post(
+            '/api/v1/auth/login/', {'email': 'reviewer@example.com', 'password': 'password123'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        self.assertEqual(self.client.get('/api/v1/auth/profile/').status_code, status.HTTP_200_OK)
+
+    def test_role_change_revokes_tokens(self):
+        self.user.role = Role.objects.create(role='admission_officer')
+        self.user.save()
+        self.assertEqual(self.client.get('/api/v1/auth/profile/').status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivation_revokes_tokens(self):
+        self.user.is_active = False
+        self.user.save(update_fields=['is_active'])
+        self.assertEqual(self.client.get('/api/v1/auth/profile/').status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_password_change_revokes_tokens(self):
+        self.user.set_password('another-password')
+        self.user.save()
+        self.assertEqual(self.client.get('/api/v1/auth/profile/').status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_other_changes_keep_tokens(self):
+        self.user.first_name = 'Renamed'
+        self.user.save()
+        self.assertEqual(self.client.get('/api/v1/auth/profile/').status_code, status.HTTP_200_OK)
@@ -117,13 +117,29 @@ AUTH_USER_MODEL = 'users.CustomUser'
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.common.authentication.ClaimsJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
+    # Sliding windows on the cache; login, register and verify set their own throttles
+    'DEFAULT_THROTTLE_CLASSES': [
+        'apps.common.throttling.RoleRateThrottle',
+        'apps.common.throttling.UploadRateThrottle',
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        'anon': config('THROTTLE_ANON_RATE', default='120/min'),
+        'user': config('THROTTLE_USER_RATE', default='600/min'),
+        'user_applicant': config('THROTTLE_APPLICANT_RATE', default='120/min'),
+        'uploads': config('THROTTLE_UPLOAD_RATE', default='120/hour'),
+        'uploads_applicant': config('THROTTLE_APPLICANT_UPLOAD_RATE', default='30/hour'),
+        'login_ip': config('THROTTLE_LOGIN_IP_RATE', default='20/min'),
+        'login_account': config('THROTTLE_LOGIN_ACCOUNT_RATE', default='5/min'),
+        'register_ip': config('THROTTLE_REGISTER_IP_RATE', default='10/hour'),
+        'verify_ip': config('THROTTLE_VERIFY_IP_RATE', default='600/min'),
+    },
 }
 
 SIMPLE_JWT = {
@@ -132,8 +148,15 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
+    'TOKEN_OBTAIN_SERIALIZER': 'apps.api.serializers.ClaimsTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'apps.api.serializers.ClaimsTokenRefreshSerializer',
 }
 
+# Cached copy of each user's token version, checked on every request
+TOKEN_VERSION_CACHE_TIMEOUT = config('TOKEN_VERSION_CACHE_TIMEOUT', default=86400, cast=int)
+# Expired entries of the refresh token blacklist are deleted at most this often (seconds)
+TOKEN_BLACKLIST_PRUNE_INTERVAL = config('TOKEN_BLACKLIST_PRUNE_INTERVAL', default=3600, cast=int)
+
 SPECTACULAR_SETTINGS = {
     'TITLE': 'College Admission API',
     'DESCRIPTION': 'API backend for managing Pakistani college admissions.',
@@ -146,6 +169,37 @@ SPECTACULAR_SETTINGS = {
 FILE_UPLOAD_MAX_MEMORY_SIZE = config('FILE_UPLOAD_MAX_MEMORY_SIZE', default=5242880, cast=int)
 DATA_UPLOAD_MAX_MEMORY_SIZE = config('DATA_UPLOAD_MAX_MEMORY_SIZE', default=5242880, cast=int)
 
+# Background tasks (run queued jobs with `manage.py run_worker`)
+BACKGROUND_TASK_BACKEND = config('BACKGROUND_TASK_BACKEND', default='apps.common.tasks.DatabaseBackend')
+BACKGROUND_TASK_THREADS = config('BACKGROUND_TASK_THREADS', default=2, cast=int)
+BACKGROUND_JOB_MAX_ATTEMPTS = config('BACKGROUND_JOB_MAX_ATTEMPTS', default=5, cast=int)
+BACKGROUND_JOB_RETRY_DELAY = config('BACKGROUND_JOB_RETRY_DELAY', default=30, cast=int)
+BACKGROUND_JOB_TIMEOUT = config('BACKGROUND_JOB_TIMEOUT', default=600, cast=int)
+
+# Cached statistics are invalidated on change; the timeout only bounds memory
+ADMISSION_STATS_CACHE_TIMEOUT = config('ADMISSION_STATS_CACHE_TIMEOUT', default=3600, cast=int)
+
+# Public verification lookups: known hashes are invalidated on status change,
+# unknown hashes are cached briefly to absorb bursts of bad scans
+VERIFICATION_CACHE_TIMEOUT = config('VERIFICATION_CACHE_TIMEOUT', default=86400, cast=int)
+VERIFICATION_NEGATIVE_CACHE_TIMEOUT = config('VERIFICATION_NEGATIVE_CACHE_TIMEOUT', default=60, cast=int)
+
+# Processes used to render admission letters in batch (0 = all cores)
+ADMISSION_LETTER_WORKERS = config('ADMISSION_LETTER_WORKERS', default=0, cast=int)
+
+# Bulk account provisioning: rows per INSERT and password hashing processes (0 = all cores)
+PROVISIONING_BATCH_SIZE = config('PROVISIONING_BATCH_SIZE', default=1000, cast=int)
+PROVISIONING_WORKERS = config('PROVISIONING_WORKERS', default=0, cast=int)
+# Uploaded provisioning CSVs hold plaintext passwords; keep them outside MEDIA_ROOT
+PROVISIONING_UPLOAD_DIR = BASE_DIR / config('PROVISIONING_UPLOAD_DIR', default='private/provisioning')
+
+# Merit list: weight applied to the best percentage per degree name.
+# Overridden at runtime by the `merit_degree_weights` SystemSettings entry (JSON).
+MERIT_DEGREE_WEIGHTS = {
+    'Matric': 0.3,
+    'Intermediate': 0.7,
+}
+
 # Email Configuration
 EMAIL_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.console.EmailBackend')
 EMAIL_HOST = config('EMAIL_HOST', default='')
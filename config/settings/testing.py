@@ -37,4 +37,7 @@ CACHES = {
 }
 
 # Email backend for testing
-EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
\ No newline at end of file
+EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+
+# Run background tasks inline
+BACKGROUND_TASK_BACKEND = 'apps.common.tasks.ImmediateBackend'
\ No newline at end of file